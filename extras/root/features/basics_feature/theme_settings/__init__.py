@@ -9,7 +9,9 @@ theme_settings_frame: root_FrameParams_dict = {
     "layer_frame": "disable",
 }
 
-content.dispatch("data", "available_fonts")(System.Infos.available_fonts)
+content.dispatch("data", "available_fonts", cache={"ttl": 300})(
+    System.Infos.available_fonts
+)
 
 
 @content.dispatch("task")
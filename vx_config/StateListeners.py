@@ -0,0 +1,148 @@
+import inspect, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from typing import Any, Callable, TypedDict
+from vx_logger import Logger
+
+
+class StateItem(TypedDict):
+    key: str
+    value: Any
+
+
+StateListener = Callable[[StateItem], Any]
+
+
+def is_glob(pattern: str) -> bool:
+    return any(char in pattern for char in "*?[")
+
+
+def get_listener_name(listener: StateListener) -> str:
+    return getattr(listener, "__qualname__", None) or repr(listener)
+
+
+class StateListeners:
+    """
+    State listeners indexed by key, by key pattern (e.g. 'vx_ui_*') or for
+    every key.
+
+    Listeners never run in the thread setting the state: async listeners are
+    scheduled on the API loop, sync ones all run on the single
+    'vx_state_listeners' thread, so each listener gets its items one at a
+    time and in the order the state changed. A slow sync listener therefore
+    delays the other sync listeners.
+    """
+
+    slow_threshold: float = 0.1
+    executor = ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="vx_state_listeners"
+    )
+
+    def __init__(self):
+        self.__key_listeners: dict[str, list[StateListener]] = {}
+        self.__glob_listeners: dict[str, list[StateListener]] = {}
+        self.__all_listeners: list[StateListener] = []
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def shutdown():
+        StateListeners.executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def __log_duration(listener: StateListener, item: StateItem, started: float):
+        duration = time.perf_counter() - started
+
+        if duration > StateListeners.slow_threshold:
+            Logger.log(
+                f"State listener '{get_listener_name(listener)}' took {duration:.3f}s for '{item['key']}'",
+                "WARNING",
+            )
+
+    @staticmethod
+    def call(listener: StateListener, item: StateItem):
+        started = time.perf_counter()
+
+        try:
+            listener(item)
+        except Exception as exception:
+            Logger.log_exception(exception)
+
+        StateListeners.__log_duration(listener, item, started)
+
+    @staticmethod
+    async def call_async(listener: StateListener, item: StateItem):
+        started = time.perf_counter()
+
+        try:
+            await listener(item)
+        except Exception as exception:
+            Logger.log_exception(exception)
+
+        StateListeners.__log_duration(listener, item, started)
+
+    def add(self, listener: StateListener, keys: list[str] = None):
+        with self.__lock:
+            for listeners in self.__get_lists(keys, True):
+                if not listener in listeners:
+                    listeners.append(listener)
+
+    def remove(self, listener: StateListener, keys: list[str] = None):
+        with self.__lock:
+            # Without keys, the listener is removed for every key.
+            if keys is None:
+                lists = [
+                    self.__all_listeners,
+                    *self.__key_listeners.values(),
+                    *self.__glob_listeners.values(),
+                ]
+            else:
+                lists = self.__get_lists(keys)
+
+            for listeners in lists:
+                if listener in listeners:
+                    listeners.remove(listener)
+
+            for index in [self.__key_listeners, self.__glob_listeners]:
+                for key in [key for key, listeners in index.items() if not listeners]:
+                    del index[key]
+
+    def __get_lists(
+        self, keys: list[str] | None, create: bool = False
+    ) -> list[list[StateListener]]:
+        if keys is None:
+            return [self.__all_listeners]
+
+        lists = []
+
+        for key in keys:
+            index = self.__glob_listeners if is_glob(key) else self.__key_listeners
+
+            if create:
+                lists.append(index.setdefault(key, []))
+            elif key in index:
+                lists.append(index[key])
+
+        return lists
+
+    def match(self, key: str) -> list[StateListener]:
+        with self.__lock:
+            listeners = [
+                *self.__all_listeners,
+                *self.__key_listeners.get(key, []),
+            ]
+
+            for pattern, glob_listeners in self.__glob_listeners.items():
+                if fnmatchcase(key, pattern):
+                    listeners.extend(glob_listeners)
+
+            # A listener matching the key several times is called once.
+            return list(dict.fromkeys(listeners))
+
+    def dispatch(self, item: StateItem):
+        from vx_shell import AsyncLoop
+
+        for listener in self.match(item["key"]):
+            if inspect.iscoroutinefunction(listener):
+                AsyncLoop.run_task(StateListeners.call_async(listener, item))
+            else:
+                StateListeners.executor.submit(StateListeners.call, listener, item)
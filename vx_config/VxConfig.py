@@ -1,7 +1,11 @@
-import subprocess, os, json, locale
-from typing import Callable, TypedDict, Any, Literal, Optional
+import subprocess, os, json, locale, threading, copy, uuid
+from collections import deque
+from itertools import islice
+from fnmatch import fnmatchcase
+from typing import TypedDict, NotRequired, Any, Literal, Optional
 from fastapi import WebSocket
-from vx_path import VxPath
+from vx_path import VxPath, write_json
+from .StateListeners import StateListeners, StateListener, StateItem, is_glob
 
 
 class OutputEvent(TypedDict):
@@ -9,14 +13,75 @@ class OutputEvent(TypedDict):
     data: Optional[dict]
 
 
-class StateItem(TypedDict):
+class StateJournalEntry(TypedDict):
+    option: Literal["set", "remove"]
     key: str
-    value: Any
+    value: NotRequired[Any]
+
+
+class StateChanges(TypedDict):
+    epoch: str
+    version: int
+    full: bool
+    items: dict[str, Any]
+    removed: list[str]
+
+
+def state_items_event(items: dict[str, Any], version: int) -> OutputEvent:
+    if len(items) == 1:
+        key, value = next(iter(items.items()))
+        return OutputEvent(
+            id="UPDATE", data={"key": key, "value": value, "version": version}
+        )
+
+    return OutputEvent(id="UPDATE_ITEMS", data={"items": items, "version": version})
+
+
+def get_state_items(event: OutputEvent) -> dict[str, Any]:
+    if event["id"] == "UPDATE":
+        return {event["data"]["key"]: event["data"]["value"]}
+
+    return event["data"]["items"]
+
+
+def merge_state_events(pending: OutputEvent, event: OutputEvent) -> OutputEvent:
+    return state_items_event(
+        {**get_state_items(pending), **get_state_items(event)},
+        event["data"]["version"],
+    )
+
+
+def match_patterns(key: str, patterns: list[str]) -> bool:
+    return any(fnmatchcase(key, pattern) for pattern in patterns)
 
 
 class VxConfig:
     websockets: list[WebSocket] = []
-    listeners: list[Callable[[StateItem], None]] = []
+    listeners = StateListeners()
+    # Sockets that subscribed to state keys only receive the updates of
+    # these keys, the other ones receive every update.
+    __key_websockets: dict[str, set[WebSocket]] = {}
+    __glob_websockets: dict[str, set[WebSocket]] = {}
+    __websocket_patterns: dict[WebSocket, set[str]] = {}
+    __subscriptions_lock = threading.Lock()
+    __pending_updates: dict[str, Any] = {}
+    __pending_version: int = 0
+    __flush_scheduled: bool = False
+    __updates_lock = threading.Lock()
+    # Saved state changes are appended to a journal which is compacted into
+    # the config file once it gets too long.
+    JOURNAL_MAX_ENTRIES: int = 256
+    __saved_state: dict = {}
+    __journal_entries: int = 0
+    __journal_lock = threading.RLock()
+    # Every state change increments the version, the keys changed by the
+    # latest versions are kept to resync reconnecting clients.
+    STATE_EPOCH: str = uuid.uuid4().hex
+    STATE_VERSION: int = 0
+    CHANGE_LOG_SIZE: int = 512
+    __key_versions: dict[str, int] = {}
+    __change_log: deque[tuple[int, str]] = deque(maxlen=CHANGE_LOG_SIZE)
+    __version_lock = threading.Lock()
 
     API_PORT: int = 6481
     FRONT_PORT: int = 6492
@@ -38,11 +103,114 @@ class VxConfig:
     }
 
     @staticmethod
-    def dispatch_websocket_event(event: OutputEvent):
-        from vx_shell import AsyncLoop
+    def dispatch_websocket_event(event: OutputEvent, key: str = None):
+        from vx_shell import SocketQueue
 
         for websocket in VxConfig.websockets:
-            AsyncLoop.run_task(websocket.send_json(event))
+            SocketQueue.send(websocket, event, key)
+
+    @staticmethod
+    def subscribe_state(websocket: WebSocket, patterns: list[str]):
+        with VxConfig.__subscriptions_lock:
+            for pattern in patterns:
+                index = (
+                    VxConfig.__glob_websockets
+                    if is_glob(pattern)
+                    else VxConfig.__key_websockets
+                )
+                index.setdefault(pattern, set()).add(websocket)
+                VxConfig.__websocket_patterns.setdefault(websocket, set()).add(pattern)
+
+    @staticmethod
+    def unsubscribe_state(websocket: WebSocket, patterns: list[str] = None):
+        with VxConfig.__subscriptions_lock:
+            websocket_patterns = VxConfig.__websocket_patterns.get(websocket, set())
+
+            for pattern in list(websocket_patterns) if patterns is None else patterns:
+                index = (
+                    VxConfig.__glob_websockets
+                    if is_glob(pattern)
+                    else VxConfig.__key_websockets
+                )
+                websockets = index.get(pattern)
+
+                if websockets:
+                    websockets.discard(websocket)
+
+                    if not websockets:
+                        del index[pattern]
+
+                websocket_patterns.discard(pattern)
+
+            # A socket left without patterns stays subscribed to nothing,
+            # only a full unsubscribe brings back every update.
+            if patterns is None:
+                VxConfig.__websocket_patterns.pop(websocket, None)
+
+    @staticmethod
+    def get_state_patterns(websocket: WebSocket) -> list[str] | None:
+        with VxConfig.__subscriptions_lock:
+            patterns = VxConfig.__websocket_patterns.get(websocket)
+            return None if patterns is None else list(patterns)
+
+    @staticmethod
+    def get_state_websockets(key: str) -> list[WebSocket]:
+        with VxConfig.__subscriptions_lock:
+            websockets = set(VxConfig.__key_websockets.get(key, ()))
+
+            for pattern, glob_websockets in VxConfig.__glob_websockets.items():
+                if fnmatchcase(key, pattern):
+                    websockets |= glob_websockets
+
+            return [
+                websocket
+                for websocket in VxConfig.websockets
+                if websocket in websockets
+                or not websocket in VxConfig.__websocket_patterns
+            ]
+
+    @staticmethod
+    def __queue_update(key: str, value: Any, version: int):
+        # Changes from any thread (the loop thread included) are collected and
+        # broadcast once per loop iteration.
+        with VxConfig.__updates_lock:
+            VxConfig.__pending_updates[key] = value
+            VxConfig.__pending_version = max(VxConfig.__pending_version, version)
+
+            if VxConfig.__flush_scheduled:
+                return
+
+            VxConfig.__flush_scheduled = True
+
+        from vx_shell import AsyncLoop
+
+        AsyncLoop.loop.call_soon_threadsafe(VxConfig.__flush_updates)
+
+    @staticmethod
+    def __flush_updates():
+        from vx_shell import SocketQueue
+
+        with VxConfig.__updates_lock:
+            updates = VxConfig.__pending_updates
+            version = VxConfig.__pending_version
+            VxConfig.__pending_updates = {}
+            VxConfig.__flush_scheduled = False
+
+        websockets_items: dict[WebSocket, dict[str, Any]] = {}
+
+        for key, value in updates.items():
+            for websocket in VxConfig.get_state_websockets(key):
+                websockets_items.setdefault(websocket, {})[key] = value
+
+        # A single pending state event per socket, so a slow socket receives
+        # the latest values in one message.
+        for websocket, items in websockets_items.items():
+            SocketQueue.send(
+                websocket,
+                state_items_event(items, version),
+                "STATE",
+                merge_state_events,
+            )
 
     @staticmethod
     def gtk_fonts():
@@ -87,67 +255,158 @@ class VxConfig:
                 VxConfig.FRONT_PORT = vx_config.get("front_port")
                 VxConfig.FRONT_DEV_PORT = vx_config.get("front_dev_port")
                 VxConfig.STATE = vx_config.get("state")
+
+            # Saves made since the last compaction are applied on top of the
+            # state of the config file.
+            with VxConfig.__journal_lock:
+                VxConfig.__saved_state = VxConfig.STATE
+                VxConfig.__replay_journal()
+                VxConfig.STATE = copy.deepcopy(VxConfig.__saved_state)
+
+                if os.path.exists(VxPath.VX_STATE_JOURNAL_FILE):
+                    VxConfig.__compact()
         else:
             VxConfig.save()
 
     @staticmethod
     def save():
-        file_path = VxPath.VX_CONFIG_FILE
+        with VxConfig.__journal_lock:
+            VxConfig.__saved_state = copy.deepcopy(VxConfig.STATE)
+            VxConfig.__compact()
 
-        data = {
-            "api_port": VxConfig.API_PORT,
-            "front_port": VxConfig.FRONT_PORT,
-            "front_dev_port": VxConfig.FRONT_DEV_PORT,
-            "state": VxConfig.STATE,
-        }
+    @staticmethod
+    def __replay_journal():
+        file_path = VxPath.VX_STATE_JOURNAL_FILE
+
+        if not os.path.exists(file_path):
+            return
+
+        with open(file_path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry: StateJournalEntry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Only the last entry can be torn by a crash.
+                    break
+
+                if entry["option"] == "remove":
+                    VxConfig.__saved_state.pop(entry["key"], None)
+                else:
+                    VxConfig.__saved_state[entry["key"]] = entry["value"]
+
+    @staticmethod
+    def __compact():
+        # Rewrites the config file with the saved state then empties the
+        # journal, the config file is replaced atomically.
+        file_path = VxPath.VX_CONFIG_FILE
+        vx_config: dict = {}
 
         if os.path.exists(file_path):
-            with open(file_path, "w", encoding="utf-8") as file:
-                json.dump(data, file, indent=4, ensure_ascii=False)
-        else:
-            with open(file_path, "x", encoding="utf-8") as file:
-                json.dump(data, file, indent=4, ensure_ascii=False)
+            with open(file_path, "r", encoding="utf-8") as file:
+                vx_config = json.load(file)
+
+        vx_config.update(
+            {
+                "api_port": VxConfig.API_PORT,
+                "front_port": VxConfig.FRONT_PORT,
+                "front_dev_port": VxConfig.FRONT_DEV_PORT,
+                "state": VxConfig.__saved_state,
+            }
+        )
+        write_json(file_path, vx_config)
+
+        if os.path.exists(VxPath.VX_STATE_JOURNAL_FILE):
+            os.remove(VxPath.VX_STATE_JOURNAL_FILE)
+
+        VxConfig.__journal_entries = 0
 
     @staticmethod
-    def save_state():
+    def __write_journal(entries: list[StateJournalEntry]):
+        if not entries:
+            return
+
+        for entry in entries:
+            if entry["option"] == "remove":
+                VxConfig.__saved_state.pop(entry["key"], None)
+            else:
+                VxConfig.__saved_state[entry["key"]] = copy.deepcopy(entry["value"])
+
+        try:
+            with open(VxPath.VX_STATE_JOURNAL_FILE, "a", encoding="utf-8") as file:
+                file.write(
+                    "".join(
+                        json.dumps(entry, ensure_ascii=False) + "\n"
+                        for entry in entries
+                    )
+                )
+                file.flush()
+                os.fsync(file.fileno())
+        except OSError:
+            # A failed append may leave a torn entry, which would hide the
+            # next ones on replay, the saved state is compacted instead.
+            return VxConfig.__compact()
+
+        VxConfig.__journal_entries += len(entries)
+
+        if VxConfig.__journal_entries >= VxConfig.JOURNAL_MAX_ENTRIES:
+            VxConfig.__compact()
+
+    @staticmethod
+    def __check_config_file():
         file_path = VxPath.VX_CONFIG_FILE
 
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Unable to found '{file_path}' file")
 
-        with open(file_path, "r", encoding="utf-8") as file:
-            vx_config: dict = json.load(file)
-            vx_config["state"] = VxConfig.STATE
-
-        with open(file_path, "w", encoding="utf-8") as file:
-            json.dump(vx_config, file, indent=4, ensure_ascii=False)
+    @staticmethod
+    def save_state():
+        VxConfig.__check_config_file()
+
+        # Only the keys that differ from the saved state are journaled.
+        with VxConfig.__journal_lock:
+            entries = [
+                StateJournalEntry(option="set", key=key, value=value)
+                for key, value in VxConfig.STATE.items()
+                if not key in VxConfig.__saved_state
+                or VxConfig.__saved_state[key] != value
+            ] + [
+                StateJournalEntry(option="remove", key=key)
+                for key in VxConfig.__saved_state.keys()
+                if not key in VxConfig.STATE
+            ]
+            VxConfig.__write_journal(entries)
 
-        VxConfig.dispatch_websocket_event(OutputEvent(id="SAVE", data=VxConfig.STATE))
+        VxConfig.dispatch_websocket_event(
+            OutputEvent(id="SAVE", data=VxConfig.STATE), "SAVE"
+        )
 
     @staticmethod
     def save_state_items(
         keys: list[str], option: Literal["update", "add", "remove"] = "update"
     ):
-        file_path = VxPath.VX_CONFIG_FILE
+        VxConfig.__check_config_file()
 
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Unable to found '{file_path}' file")
-
-        with open(file_path, "r", encoding="utf-8") as file:
-            vx_config: dict = json.load(file)
+        with VxConfig.__journal_lock:
+            entries: list[StateJournalEntry] = []
 
             for key in keys:
                 if option == "update" or option == "add":
-                    if not key in vx_config["state"] and option == "update":
+                    if not key in VxConfig.__saved_state and option == "update":
                         raise KeyError(f"'{key}' state key not found")
 
-                    vx_config["state"][key] = VxConfig.STATE[key]
+                    entries.append(
+                        StateJournalEntry(
+                            option="set", key=key, value=VxConfig.STATE[key]
+                        )
+                    )
 
                 elif option == "remove":
-                    del vx_config["state"][key]
+                    if not key in VxConfig.__saved_state:
+                        raise KeyError(key)
 
-        with open(file_path, "w", encoding="utf-8") as file:
-            json.dump(vx_config, file, indent=4, ensure_ascii=False)
+                    entries.append(StateJournalEntry(option="remove", key=key))
+
+            VxConfig.__write_journal(entries)
 
         if option == "update":
             VxConfig.dispatch_websocket_event(
@@ -155,14 +414,14 @@ class VxConfig:
             )
 
     @staticmethod
-    def add_state_listener(listener: Callable[[StateItem], None]):
-        if not listener in VxConfig.listeners:
-            VxConfig.listeners.append(listener)
+    def add_state_listener(listener: StateListener, keys: list[str] = None):
+        # Sync listeners run in order on the 'vx_state_listeners' thread,
+        # async ones on the API loop (see StateListeners).
+        VxConfig.listeners.add(listener, keys)
 
     @staticmethod
-    def remove_state_listener(listener: Callable[[StateItem], None]):
-        if listener in VxConfig.listeners:
-            VxConfig.listeners.remove(listener)
+    def remove_state_listener(listener: StateListener, keys: list[str] = None):
+        VxConfig.listeners.remove(listener, keys)
 
     @staticmethod
     def update_state(
@@ -175,7 +434,7 @@ class VxConfig:
                 if key in VxConfig.STATE:
                     raise KeyError(f"'{key}' state key already exists")
 
-                VxConfig.STATE[key] = value
+                VxConfig.__set_state_item(key, value)
                 keys_processed.append(key)
 
         if option == "remove":
@@ -183,12 +442,89 @@ class VxConfig:
                 if not key in VxConfig.STATE:
                     raise KeyError(f"'{key}' state key not found")
 
-                VxConfig.STATE.pop(key, None)
+                VxConfig.__set_state_item(key, remove=True)
                 keys_processed.append(key)
 
         if save:
             VxConfig.save_state_items(keys_processed, option)
 
+    @staticmethod
+    def __set_state_item(
+        key: str, value: Any = None, remove: bool = False, notify: bool = False
+    ) -> int:
+        with VxConfig.__version_lock:
+            VxConfig.STATE_VERSION += 1
+
+            if remove:
+                VxConfig.STATE.pop(key, None)
+                VxConfig.__key_versions.pop(key, None)
+            else:
+                VxConfig.STATE[key] = value
+                VxConfig.__key_versions[key] = VxConfig.STATE_VERSION
+
+            VxConfig.__change_log.append((VxConfig.STATE_VERSION, key))
+
+            # Notified under the lock, so concurrent changes of a key reach
+            # sockets and listeners in version order.
+            if notify:
+                VxConfig.__queue_update(key, value, VxConfig.STATE_VERSION)
+                VxConfig.listeners.dispatch(StateItem(key=key, value=value))
+
+            return VxConfig.STATE_VERSION
+
+    @staticmethod
+    def get_state_version(key: str = None) -> int:
+        with VxConfig.__version_lock:
+            if key is None:
+                return VxConfig.STATE_VERSION
+
+            if not key in VxConfig.STATE:
+                raise KeyError(f"'{key}' state key not found")
+
+            return VxConfig.__key_versions.get(key, 0)
+
+    @staticmethod
+    def get_state_changes(
+        version: int = None, epoch: str = None, patterns: list[str] = None
+    ) -> StateChanges:
+        # Returns the keys changed since the given version, or every key when
+        # the version is unknown, from another run or older than the log.
+        with VxConfig.__version_lock:
+            current_version = VxConfig.STATE_VERSION
+            change_log = VxConfig.__change_log
+
+            full = (
+                version is None
+                or epoch != VxConfig.STATE_EPOCH
+                or version > current_version
+                or (
+                    version < current_version
+                    and (not change_log or change_log[0][0] > version + 1)
+                )
+            )
+
+            if full:
+                keys = list(VxConfig.STATE.keys())
+            else:
+                # The log versions are consecutive.
+                start = version + 1 - change_log[0][0] if change_log else 0
+                keys = list(
+                    dict.fromkeys(key for _, key in islice(change_log, start, None))
+                )
+
+            if patterns is not None:
+                keys = [key for key in keys if match_patterns(key, patterns)]
+
+            return StateChanges(
+                epoch=VxConfig.STATE_EPOCH,
+                version=current_version,
+                full=full,
+                items={
+                    key: VxConfig.STATE[key] for key in keys if key in VxConfig.STATE
+                },
+                removed=[key for key in keys if not key in VxConfig.STATE],
+            )
+
     @staticmethod
     def get_state(key: str):
         if not key in VxConfig.STATE:
@@ -196,19 +532,18 @@ class VxConfig:
 
         return VxConfig.STATE[key]
 
+    @staticmethod
+    def get_state_items(keys: list[str]) -> dict[str, Any]:
+        missing_keys = [key for key in keys if not key in VxConfig.STATE]
+
+        if missing_keys:
+            raise KeyError(f"'{', '.join(missing_keys)}' state keys not found")
+
+        return {key: VxConfig.STATE[key] for key in keys}
+
     @staticmethod
     def set_state(key: str, value: Any):
         if not key in VxConfig.STATE:
             raise KeyError(f"'{key}' state key not found")
 
-        VxConfig.STATE[key] = value
-
-        VxConfig.dispatch_websocket_event(
-            OutputEvent(
-                id="UPDATE",
-                data={"key": key, "value": value},
-            )
-        )
-
-        for listener in VxConfig.listeners:
-            listener(StateItem(key=key, value=value))
+        VxConfig.__set_state_item(key, value, notify=True)
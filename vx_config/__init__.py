@@ -1 +1,2 @@
 from .VxConfig import VxConfig
+from .StateListeners import StateListeners, StateListener, StateItem
@@ -0,0 +1,69 @@
+import json, threading, time
+from collections import OrderedDict
+from typing import Any, TypedDict
+
+
+class ContentCacheOptions(TypedDict, total=False):
+    ttl: float | None
+    max_entries: int
+
+
+class ContentCacheMetrics(TypedDict):
+    hits: int
+    misses: int
+    entries: int
+
+
+class ContentCache:
+    @staticmethod
+    def key_from(args: list) -> str:
+        return json.dumps(args, sort_keys=True)
+
+    def __init__(self, ttl: float | None = None, max_entries: int = 32):
+        if max_entries < 1:
+            raise ValueError("Cache 'max_entries' should be greater than 0")
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry and (self.ttl is None or time.monotonic() < entry[0]):
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+
+            if entry:
+                del self.__entries[key]
+
+            self.misses += 1
+            return False, None
+
+    def set(self, key: str, value: Any):
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+
+        with self.__lock:
+            self.__entries[key] = (expires_at, value)
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+    def invalidate(self, key: str = None):
+        with self.__lock:
+            if key is None:
+                self.__entries.clear()
+            else:
+                self.__entries.pop(key, None)
+
+    def metrics(self) -> ContentCacheMetrics:
+        with self.__lock:
+            return ContentCacheMetrics(
+                hits=self.hits, misses=self.misses, entries=len(self.__entries)
+            )
@@ -1,11 +1,19 @@
-from typing import Callable
+import inspect
+from typing import Callable, TypedDict
 from vx_types import FeatureContentType
+from .ContentCache import ContentCache, ContentCacheOptions, ContentCacheMetrics
 from .utils import FeatureUtils
 
 
 class rootcontent: ...
 
 
+class ContentOptions(TypedDict, total=False):
+    timeout: float | None
+    source: bool
+    current: Callable | None
+
+
 class RootContents:
     _instances = {}
 
@@ -31,11 +39,34 @@ class RootContents:
             self.data = rootcontent()
             self.socket = rootcontent()
             self.menu = rootcontent()
+            self.options: dict[str, dict[str, ContentOptions]] = {}
+            self.caches: dict[str, ContentCache] = {}
+
+    def dispatch(
+        self,
+        content_type: FeatureContentType,
+        name: str = None,
+        timeout: float | None = None,
+        cache: ContentCacheOptions | None = None,
+        source: bool = False,
+        current: Callable | None = None,
+    ):
+        if cache is not None and content_type != "data":
+            raise ValueError("Only data contents can be cached")
+
+        if source and content_type != "data":
+            raise ValueError("Only data contents can be sources")
 
-    def dispatch(self, content_type: FeatureContentType, name: str = None):
         def decorator(callback: Callable):
             content_name = callback.__name__ if name is None else name
 
+            # Sources only push changes, the current value hook serves their
+            # value to one-shot requests while they are not running.
+            if current is not None and not (
+                source or inspect.isasyncgenfunction(callback)
+            ):
+                raise ValueError("Only data sources can have a current value hook")
+
             try:
                 sub_content: rootcontent = getattr(self, content_type)
             except AttributeError:
@@ -52,6 +83,13 @@ class RootContents:
                 )
 
             sub_content.__dict__[content_name] = callback
+            self.options.setdefault(content_type, {})[content_name] = ContentOptions(
+                timeout=timeout, source=source, current=current
+            )
+
+            if cache is not None:
+                self.caches[content_name] = ContentCache(**cache)
+
             return callback
 
         return decorator
@@ -68,6 +106,10 @@ class RootContents:
             )
 
         sub_content.__dict__.pop(name)
+        self.options.get(content_type, {}).pop(name, None)
+
+        if content_type == "data":
+            self.caches.pop(name, None)
 
     def exists(self, content_type: FeatureContentType, name: str) -> bool:
         try:
@@ -80,3 +122,23 @@ class RootContents:
     def get(self, content_type: FeatureContentType, name: str) -> Callable:
         sub_content: rootcontent = getattr(self, content_type)
         return sub_content.__dict__[name]
+
+    def get_options(
+        self, content_type: FeatureContentType, name: str
+    ) -> ContentOptions:
+        return self.options.get(content_type, {}).get(name, ContentOptions())
+
+    def get_cache(self, name: str) -> ContentCache | None:
+        return self.caches.get(name)
+
+    def invalidate(self, name: str, args: list | None = None):
+        if not self.exists("data", name):
+            raise Exception(f"Data content '{name}' is not dispatched")
+
+        cache = self.caches.get(name)
+
+        if cache:
+            cache.invalidate(None if args is None else ContentCache.key_from(args))
+
+    def cache_metrics(self) -> dict[str, ContentCacheMetrics]:
+        return {name: cache.metrics() for name, cache in self.caches.items()}
@@ -1,8 +1,10 @@
 from .RootFeature import RootFeature
 from .RootContents import RootContents
+from .ContentCache import ContentCache, ContentCacheOptions
 from .params import (
     ParamDataHandler,
     ParamData,
     ParamsValueError,
+    FrameParamsSnapshot,
 )
 from .utils import FeatureUtils
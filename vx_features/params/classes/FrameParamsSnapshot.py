@@ -0,0 +1,44 @@
+import itertools
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping
+
+snapshot_versions = itertools.count(1)
+
+
+class FrameParamsSnapshot(Mapping):
+    """
+    Immutable view of the effective (root and user merged) params of a frame,
+    keyed by the param paths relative to the frame.
+    """
+
+    __slots__ = ("frame_id", "version", "__values", "__nodes")
+
+    def __init__(
+        self, frame_id: str, values: dict[str, Any], nodes: dict[str, bool]
+    ) -> None:
+        object.__setattr__(self, "frame_id", frame_id)
+        object.__setattr__(self, "version", next(snapshot_versions))
+        object.__setattr__(self, "_FrameParamsSnapshot__values", values)
+        object.__setattr__(self, "_FrameParamsSnapshot__nodes", nodes)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Frame params snapshots are immutable")
+
+    def __getitem__(self, path: str) -> Any | None:
+        return self.__values[path]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__values)
+
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    def __call__(self, path: str) -> Any | None:
+        return self.__values.get(path)
+
+    @property
+    def nodes(self) -> Mapping[str, bool]:
+        return MappingProxyType(self.__nodes)
+
+    def node_is_define(self, path: str) -> bool:
+        return self.__nodes[path]
@@ -1,7 +1,8 @@
-import copy
 from pydantic import ValidationError
-from typing import Callable, Any
 from .RootBuilder import RootBuilder
+from .ParamIndex import ParamIndex
+from .ParamListeners import ParamListeners
+from .FrameParamsSnapshot import FrameParamsSnapshot
 from .ParamsError import ParamsValidationError, ParamsValueError, ParamsErrorDetails
 from ..utils import read_json
 from vx_types import (
@@ -10,6 +11,7 @@ from vx_types import (
     user_FrameParams_dict,
     root_FeatureParams,
     user_FeatureParams,
+    user_FrameParams,
 )
 
 
@@ -22,8 +24,11 @@ class ParamData:
     ) -> None:
         self.root: root_FeatureParams_dict = None
         self.user: user_FeatureParams_dict = None
+        self.index: ParamIndex = None
+        self.frame_snapshots: dict[str, FrameParamsSnapshot] = {}
         self.user_filepath: str = user_params_filepath
-        self.param_listeners: dict[str, list[Callable[[str, Any], None]]] = {}
+        self.param_listeners = ParamListeners()
+        self.param_batch_listeners = ParamListeners()
         self.dev_mode: bool = dev_mode
 
         self.build_params(root_params_dict, read_json(user_params_filepath) or {})
@@ -58,70 +63,108 @@ class ParamData:
 
         self.root = params_builder.build()
         self.user = user_params.model_dump(exclude_none=True)
+        self.index = ParamIndex(self.root, self.user)
+        self.frame_snapshots = {}
 
     def create_frame_from_template(
         self, frame_id: str, frame_params_dict: user_FrameParams_dict
+    ):
+        self.create_frames_from_template({frame_id: frame_params_dict})
+
+    def create_frames_from_template(
+        self, frames_params_dict: dict[str, user_FrameParams_dict]
     ):
         if self.root["frames"] == "disable":
             raise PermissionError("Frame creation for this feature is disabled")
 
-        if frame_id in self.root["frames"]:
-            raise ValueError(f"Frame ID '{frame_id}' already exists")
-
-        template_name = frame_params_dict.get("template")
-        if not template_name:
-            raise ParamsValueError(
-                title="Validation error in frame parameters",
-                message="You must fill in the 'template' field",
-                details=ParamsErrorDetails(loc=("template",)),
-            )
-
-        user_dict: user_FeatureParams_dict = copy.deepcopy(self.user)
-
-        if not user_dict.get("frames"):
-            user_dict["frames"] = {}
-
-        user_dict["frames"][frame_id] = frame_params_dict
-
-        try:
-            self.user = user_FeatureParams(**user_dict).model_dump(exclude_none=True)
-
-        except ValidationError as validation_error:
-            raise ParamsValidationError(
-                title="Validation error",
-                validation_error=validation_error,
-            )
-
-        self.build_params(self.root, self.user, True)
+        templates = self.root.get("templates") or {}
+        user_frames: dict[str, user_FrameParams_dict] = {}
+
+        # Every frame is checked before the params are changed, only the
+        # entries of the new frames are validated and indexed.
+        for frame_id, frame_params_dict in frames_params_dict.items():
+            if frame_id in self.root["frames"]:
+                raise ValueError(f"Frame ID '{frame_id}' already exists")
+
+            template_name = frame_params_dict.get("template")
+            if not template_name:
+                raise ParamsValueError(
+                    title="Validation error in frame parameters",
+                    message="You must fill in the 'template' field",
+                    details=ParamsErrorDetails(loc=("template",)),
+                )
+
+            if not template_name in templates:
+                raise ParamsValueError(
+                    title="Validation error in frame parameters",
+                    message=f"The '{template_name}' frame template does not exist in the root parameters",
+                    details=ParamsErrorDetails(
+                        loc=("frames", frame_id, "template"), value=template_name
+                    ),
+                )
+
+            try:
+                user_frames[frame_id] = user_FrameParams(
+                    **frame_params_dict
+                ).model_dump(exclude_none=True)
+
+            except ValidationError as validation_error:
+                raise ParamsValidationError(
+                    title="Validation error",
+                    validation_error=validation_error,
+                    loc_prefix=("frames", frame_id),
+                )
+
+        self.root = {
+            **self.root,
+            "frames": {
+                **self.root["frames"],
+                **{
+                    frame_id: templates[frame_params_dict["template"]]
+                    for frame_id, frame_params_dict in user_frames.items()
+                },
+            },
+        }
+        self.user = {
+            **self.user,
+            "frames": {**(self.user.get("frames") or {}), **user_frames},
+        }
+
+        self.index.add_frames(list(user_frames.keys()), self.root, self.user)
 
     def remove_frame_from_template(self, frame_id: str):
+        self.remove_frames_from_template([frame_id])
+
+    def remove_frames_from_template(self, frame_ids: list[str]):
         if self.root["frames"] == "disable":
             raise PermissionError("Frame creation for this feature is disabled")
 
-        if not self.user.get("frames") or not frame_id in self.user["frames"]:
-            raise ValueError(f"Frame ID '{frame_id}' not exists")
+        for frame_id in frame_ids:
+            if not self.user.get("frames") or not frame_id in self.user["frames"]:
+                raise ValueError(f"Frame ID '{frame_id}' not exists")
 
-        template_name = self.user["frames"][frame_id].get("template")
-        if not template_name:
-            raise ValueError(f"Frame '{frame_id}' is not defined on a template")
+            template_name = self.user["frames"][frame_id].get("template")
+            if not template_name:
+                raise ValueError(f"Frame '{frame_id}' is not defined on a template")
 
-        root_dict: root_FeatureParams_dict = copy.deepcopy(self.root)
-        user_dict: user_FeatureParams_dict = copy.deepcopy(self.user)
+        root_frames = {
+            frame_id: frame
+            for frame_id, frame in self.root["frames"].items()
+            if not frame_id in frame_ids
+        }
+        user_frames = {
+            frame_id: frame
+            for frame_id, frame in self.user["frames"].items()
+            if not frame_id in frame_ids
+        }
 
-        root_dict["frames"].pop(frame_id)
-        user_dict["frames"].pop(frame_id)
+        self.root = {**self.root, "frames": root_frames}
+        self.user = {**self.user, "frames": user_frames}
 
-        if not user_dict["frames"].keys():
-            user_dict.pop("frames")
+        if not user_frames:
+            self.user.pop("frames")
 
-        try:
-            self.root = root_FeatureParams(**root_dict).model_dump(exclude_none=True)
-            self.user = user_FeatureParams(**user_dict).model_dump(exclude_none=True)
-
-        except ValidationError as validation_error:
-            raise ParamsValidationError(
-                title="Validation error",
-                validation_error=validation_error,
-            )
+        self.index.remove_frames(frame_ids, self.root)
 
-        self.build_params(self.root, self.user, True)
+        for frame_id in frame_ids:
+            self.frame_snapshots.pop(frame_id, None)
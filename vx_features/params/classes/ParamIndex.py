@@ -0,0 +1,161 @@
+from typing import Any, Literal
+from vx_types import (
+    root_FeatureParams_dict,
+    user_FeatureParams_dict,
+    user_FrameParams_dict,
+    ParamPermission,
+)
+
+ParamKind = Literal["NODE", "VALUE"]
+
+
+class ParamIndexEntry:
+    __slots__ = ("path_keys", "permission", "kind", "value")
+
+    def __init__(
+        self,
+        path_keys: tuple[str],
+        permission: ParamPermission,
+        kind: ParamKind,
+        value: Any = None,
+    ):
+        self.path_keys = path_keys
+        self.permission = permission
+        self.kind = kind
+        self.value = value
+
+
+def get_dict(node: dict, path_keys: tuple[str]) -> dict | Any | None:
+    for key in path_keys:
+        try:
+            node = node[key]
+        except (KeyError, TypeError):
+            return
+    return node
+
+
+class ParamIndex:
+    """
+    Maps each parameter path of a feature (without the feature name) to its
+    permission, its kind and, for values, its resolved value.
+
+    Node values are not indexed, they are read from the parameters when needed.
+    """
+
+    def __init__(
+        self,
+        root_params_dict: root_FeatureParams_dict,
+        user_params_dict: user_FeatureParams_dict,
+    ):
+        self.__root = root_params_dict
+        self.__entries: dict[str, ParamIndexEntry] = {}
+        self.__frame_entries: dict[str, dict[str, ParamIndexEntry]] = {}
+
+        self.__index(
+            user_FeatureParams_dict.get_structure(), root_params_dict, (), None
+        )
+        self.update_values(user_params_dict)
+
+    def __index(
+        self,
+        structure: dict,
+        root_node: Any,
+        path_keys: tuple[str],
+        permission: ParamPermission | None,
+    ):
+        if path_keys == ("frames",):
+            # Frame ids are only known from the built root parameters.
+            frame_ids = root_node.keys() if isinstance(root_node, dict) else []
+            structure = {frame_id: structure[frame_id] for frame_id in frame_ids}
+
+        for key, sub_structure in structure.items():
+            sub_keys = (*path_keys, key)
+            sub_node = root_node.get(key) if isinstance(root_node, dict) else None
+            sub_permission = permission
+
+            # Same resolution as the 'get_permission' walk: the first
+            # undefined, disabled or restricted node decides for its children.
+            if not sub_permission:
+                if sub_node is None:
+                    sub_permission = "USER"
+                elif sub_node == "disable":
+                    sub_permission = "DISABLED"
+                elif isinstance(sub_node, list):
+                    sub_permission = "RESTRICTED"
+
+            entry = ParamIndexEntry(
+                sub_keys,
+                sub_permission or "ROOT",
+                "NODE" if isinstance(sub_structure, dict) else "VALUE",
+            )
+            self.__entries[".".join(sub_keys)] = entry
+
+            if len(sub_keys) > 2 and sub_keys[0] == "frames":
+                self.__frame_entries.setdefault(sub_keys[1], {})[
+                    ".".join(sub_keys[2:])
+                ] = entry
+
+            if entry.kind == "NODE":
+                self.__index(sub_structure, sub_node, sub_keys, sub_permission)
+
+    def __resolve(
+        self, entry: ParamIndexEntry, user_params_dict: user_FeatureParams_dict
+    ) -> Any | None:
+        if entry.permission == "ROOT":
+            return get_dict(self.__root, entry.path_keys)
+        if entry.permission == "RESTRICTED":
+            return (
+                get_dict(user_params_dict, entry.path_keys)
+                or get_dict(self.__root, entry.path_keys)[0]
+            )
+        if entry.permission == "USER":
+            return get_dict(user_params_dict, entry.path_keys)
+
+    def get(self, path: str) -> ParamIndexEntry | None:
+        return self.__entries.get(path)
+
+    def get_frame_entries(self, frame_id: str) -> dict[str, ParamIndexEntry]:
+        return self.__frame_entries.get(frame_id, {})
+
+    def add_frames(
+        self,
+        frame_ids: list[str],
+        root_params_dict: root_FeatureParams_dict,
+        user_params_dict: user_FeatureParams_dict,
+    ):
+        self.__root = root_params_dict
+        root_frames = root_params_dict["frames"]
+
+        self.__index(
+            {frame_id: user_FrameParams_dict.get_structure() for frame_id in frame_ids},
+            {frame_id: root_frames[frame_id] for frame_id in frame_ids},
+            ("frames",),
+            None,
+        )
+
+        for frame_id in frame_ids:
+            for entry in self.get_frame_entries(frame_id).values():
+                if entry.kind == "VALUE":
+                    entry.value = self.__resolve(entry, user_params_dict)
+
+    def remove_frames(
+        self, frame_ids: list[str], root_params_dict: root_FeatureParams_dict
+    ):
+        self.__root = root_params_dict
+
+        for frame_id in frame_ids:
+            for param_path in self.__frame_entries.pop(frame_id, {}).keys():
+                del self.__entries[f"frames.{frame_id}.{param_path}"]
+
+            self.__entries.pop(f"frames.{frame_id}", None)
+
+    def update_values(self, user_params_dict: user_FeatureParams_dict):
+        for entry in self.__entries.values():
+            if entry.kind == "VALUE":
+                entry.value = self.__resolve(entry, user_params_dict)
+
+    def update_value(self, path: str, user_params_dict: user_FeatureParams_dict):
+        entry = self.__entries.get(path)
+
+        if entry and entry.kind == "VALUE":
+            entry.value = self.__resolve(entry, user_params_dict)
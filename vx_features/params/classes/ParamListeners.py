@@ -0,0 +1,76 @@
+from typing import Any, Callable, Iterator
+
+ParamListener = Callable[[str, Any], None]
+ParamBatchListener = Callable[[dict[str, Any]], None]
+
+
+class ParamListenerNode:
+    __slots__ = ("key", "parent", "children", "listeners")
+
+    def __init__(self, key: str = None, parent: "ParamListenerNode" = None):
+        self.key = key
+        self.parent = parent
+        self.children: dict[str, ParamListenerNode] = {}
+        self.listeners: list[ParamListener] = []
+
+
+class ParamListeners:
+    """
+    Param listeners stored in a trie of path segments, a change only visits
+    the listeners of its path and of its ancestors.
+    """
+
+    def __init__(self):
+        self.__root = ParamListenerNode()
+
+    def __find(self, path: str) -> ParamListenerNode | None:
+        node = self.__root
+
+        for key in path.split("."):
+            node = node.children.get(key)
+
+            if not node:
+                return
+
+        return node
+
+    def add(self, path: str, listener: ParamListener):
+        node = self.__root
+
+        for key in path.split("."):
+            child = node.children.get(key)
+
+            if not child:
+                child = node.children[key] = ParamListenerNode(key, node)
+
+            node = child
+
+        node.listeners.append(listener)
+
+    def remove(self, path: str, listener: ParamListener):
+        node = self.__find(path)
+
+        if not node or not listener in node.listeners:
+            return
+
+        node.listeners.remove(listener)
+
+        # Prunes the branch up to the first node still in use.
+        while node.parent and not node.listeners and not node.children:
+            del node.parent.children[node.key]
+            node = node.parent
+
+    def match(self, path: str) -> Iterator[tuple[str, list[ParamListener]]]:
+        node = self.__root
+        node_keys: list[str] = []
+
+        for key in path.split("."):
+            node = node.children.get(key)
+
+            if not node:
+                return
+
+            node_keys.append(key)
+
+            if node.listeners:
+                yield ".".join(node_keys), node.listeners.copy()
@@ -21,10 +21,17 @@ class ParamsValueError(Exception):
 
 
 class ParamsValidationError(ParamsValueError):
-    def __init__(self, title: str, validation_error: ValidationError):
+    def __init__(
+        self,
+        title: str,
+        validation_error: ValidationError,
+        loc_prefix: tuple[str] = (),
+    ):
         error_json = json.loads(validation_error.json())[0]
         message = error_json["msg"]
-        details = ParamsErrorDetails(loc=error_json["loc"], value=error_json["input"])
+        details = ParamsErrorDetails(
+            loc=(*loc_prefix, *error_json["loc"]), value=error_json["input"]
+        )
 
         super().__init__(title, message, details)
 
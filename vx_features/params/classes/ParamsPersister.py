@@ -0,0 +1,165 @@
+import threading, time
+from typing import Callable, TypedDict
+from vx_logger import Logger
+from ..utils import write_json
+
+
+class ParamsPersisterStats(TypedDict):
+    pending: bool
+    pending_since: float | None
+    flushes: int
+    last_flush: float | None
+    last_flush_duration: float | None
+    last_error: str | None
+
+
+class PendingSave:
+    def __init__(self, file_path: str, get_data: Callable[[], dict], deadline: float):
+        self.file_path = file_path
+        self.get_data = get_data
+        self.requested = time.time()
+        self.deadline = deadline
+
+
+class ParamsPersister:
+    window: float = 1
+    __pending: dict[str, PendingSave] = {}
+    __stats: dict[str, ParamsPersisterStats] = {}
+    __written: dict[str, dict] = {}
+    __condition = threading.Condition()
+    __thread: threading.Thread = None
+    __is_running: bool = False
+
+    @staticmethod
+    def schedule(key: str, file_path: str, get_data: Callable[[], dict]):
+        # Saves requested within the window are coalesced into one write of
+        # the latest data, the window starts at the first request.
+        with ParamsPersister.__condition:
+            pending = ParamsPersister.__pending.get(key)
+
+            if pending:
+                pending.file_path = file_path
+                pending.get_data = get_data
+            else:
+                ParamsPersister.__pending[key] = PendingSave(
+                    file_path, get_data, time.monotonic() + ParamsPersister.window
+                )
+
+            if not ParamsPersister.__is_running:
+                ParamsPersister.__is_running = True
+                ParamsPersister.__thread = threading.Thread(
+                    target=ParamsPersister.__run,
+                    name="vx_params_persister",
+                    daemon=True,
+                )
+                ParamsPersister.__thread.start()
+
+            ParamsPersister.__condition.notify()
+
+    @staticmethod
+    def flush(key: str = None):
+        with ParamsPersister.__condition:
+            keys = list(ParamsPersister.__pending) if key is None else [key]
+            pending_saves = [
+                (key, ParamsPersister.__pending.pop(key))
+                for key in keys
+                if key in ParamsPersister.__pending
+            ]
+
+        for key, pending in pending_saves:
+            ParamsPersister.__write(key, pending)
+
+    @staticmethod
+    def stop():
+        with ParamsPersister.__condition:
+            ParamsPersister.__is_running = False
+            ParamsPersister.__condition.notify()
+
+        if ParamsPersister.__thread:
+            ParamsPersister.__thread.join()
+            ParamsPersister.__thread = None
+
+        ParamsPersister.flush()
+
+    @staticmethod
+    def get_stats(key: str) -> ParamsPersisterStats:
+        with ParamsPersister.__condition:
+            pending = ParamsPersister.__pending.get(key)
+            stats = ParamsPersister.__stats.get(key) or ParamsPersisterStats(
+                flushes=0, last_flush=None, last_flush_duration=None, last_error=None
+            )
+
+            return ParamsPersisterStats(
+                **stats,
+                pending=bool(pending),
+                pending_since=pending.requested if pending else None,
+            )
+
+    @staticmethod
+    def get_written(key: str) -> dict | None:
+        # The last data written for the key, used to recognize our own saves.
+        with ParamsPersister.__condition:
+            return ParamsPersister.__written.get(key)
+
+    @staticmethod
+    def __write(key: str, pending: PendingSave):
+        started = time.monotonic()
+        error = None
+
+        try:
+            data = pending.get_data()
+            write_json(pending.file_path, data)
+        except Exception as exception:
+            Logger.log_exception(exception)
+            error = str(exception)
+
+        with ParamsPersister.__condition:
+            stats = ParamsPersister.__stats.setdefault(
+                key,
+                ParamsPersisterStats(
+                    flushes=0,
+                    last_flush=None,
+                    last_flush_duration=None,
+                    last_error=None,
+                ),
+            )
+            stats["last_error"] = error
+
+            if not error:
+                ParamsPersister.__written[key] = data
+                stats["flushes"] += 1
+                stats["last_flush"] = time.time()
+                stats["last_flush_duration"] = time.monotonic() - started
+
+    @staticmethod
+    def __run():
+        while True:
+            with ParamsPersister.__condition:
+                while ParamsPersister.__is_running:
+                    now = time.monotonic()
+                    due = [
+                        key
+                        for key, pending in ParamsPersister.__pending.items()
+                        if pending.deadline <= now
+                    ]
+
+                    if due:
+                        break
+
+                    deadlines = [
+                        pending.deadline
+                        for pending in ParamsPersister.__pending.values()
+                    ]
+                    ParamsPersister.__condition.wait(
+                        min(deadlines) - now if deadlines else None
+                    )
+
+                if not ParamsPersister.__is_running:
+                    return
+
+                pending_saves = [
+                    (key, ParamsPersister.__pending.pop(key)) for key in due
+                ]
+
+            for key, pending in pending_saves:
+                ParamsPersister.__write(key, pending)
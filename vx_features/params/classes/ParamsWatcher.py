@@ -0,0 +1,65 @@
+import json, os, threading
+from typing import Callable
+from watchfiles import watch
+from vx_logger import Logger
+from ..utils import read_json
+
+
+class ParamsWatcher:
+    debounce: int = 200
+
+    def __init__(self, file_path: str, on_change: Callable[[dict], None]):
+        self.file_path = os.path.abspath(file_path)
+        self.on_change = on_change
+        # -------------------------------------------- - - -
+        self.__stop_event = threading.Event()
+        self.__thread: threading.Thread = None
+
+    def start(self):
+        if self.__thread:
+            return
+
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(
+            target=self.__run, name="vx_params_watcher", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self):
+        self.__stop_event.set()
+
+        if self.__thread and self.__thread is not threading.current_thread():
+            self.__thread.join(timeout=1)
+
+        self.__thread = None
+
+    def __run(self):
+        # The directory is watched rather than the file, as the file is
+        # replaced (not modified) by atomic saves and most editors.
+        dir_path = os.path.dirname(self.file_path)
+
+        if not os.path.isdir(dir_path):
+            Logger.log(f"Cannot watch '{self.file_path}': no such directory", "WARNING")
+            return
+
+        for _ in watch(
+            dir_path,
+            watch_filter=lambda change, path: path == self.file_path,
+            debounce=ParamsWatcher.debounce,
+            stop_event=self.__stop_event,
+            recursive=False,
+        ):
+            try:
+                data = read_json(self.file_path)
+            except (OSError, json.JSONDecodeError) as exception:
+                Logger.log(f"Cannot read '{self.file_path}': {exception}", "WARNING")
+                continue
+
+            # A removed file is most likely being replaced.
+            if data is None:
+                continue
+
+            try:
+                self.on_change(data)
+            except Exception as exception:
+                Logger.log_exception(exception)
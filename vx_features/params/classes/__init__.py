@@ -1,4 +1,9 @@
 from .ParamData import ParamData
+from .ParamIndex import ParamIndex, ParamIndexEntry
+from .ParamListeners import ParamListeners, ParamListener, ParamBatchListener
+from .ParamsPersister import ParamsPersister, ParamsPersisterStats
+from .ParamsWatcher import ParamsWatcher
+from .FrameParamsSnapshot import FrameParamsSnapshot
 from .ParamsError import (
     ParamsValueError,
     ParamsErrorDetails,
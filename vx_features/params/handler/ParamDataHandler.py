@@ -1,6 +1,5 @@
-import copy
-from typing import Literal, Any, Callable
-from pydantic import ValidationError
+from typing import Literal, Any, Callable, get_args, get_origin
+from pydantic import BaseModel, ValidationError
 from vx_logger import Logger
 
 from vx_types import (
@@ -11,8 +10,17 @@ from vx_types import (
     ParamPermission,
 )
 
-from ..classes import ParamData, ParamsValidationError, ParamPermissionError
-from ..utils import write_json
+from ..classes import (
+    ParamData,
+    ParamIndexEntry,
+    ParamsPersister,
+    ParamsPersisterStats,
+    ParamsWatcher,
+    FrameParamsSnapshot,
+    ParamsValueError,
+    ParamsValidationError,
+    ParamPermissionError,
+)
 
 
 def get_dict(node: dict, path_keys: list[str]) -> dict | Any | None:
@@ -24,10 +32,21 @@ def get_dict(node: dict, path_keys: list[str]) -> dict | Any | None:
     return node
 
 
-def set_dict(node: dict, path_keys: list[str], value) -> None:
+def copy_set_dict(node: dict, path_keys: list[str], value) -> dict:
+    # Only the dicts along the path are copied, the other branches are shared
+    # with the original dict.
+    node = new_node = dict(node)
+
     for key in path_keys[:-1]:
-        node = node.setdefault(key, {})
-    node[path_keys[-1]] = value
+        child = node.get(key)
+        node[key] = node = dict(child) if isinstance(child, dict) else {}
+
+    if value is None:
+        node.pop(path_keys[-1], None)
+    else:
+        node[path_keys[-1]] = value
+
+    return new_node
 
 
 def break_path(path: str):
@@ -35,6 +54,11 @@ def break_path(path: str):
     return feature_name, path_keys
 
 
+def split_path(path: str) -> tuple[str, str]:
+    feature_name, _, param_path = path.partition(".")
+    return feature_name, param_path
+
+
 def get_permission(feature_name: str, path_keys: list[str]) -> ParamPermission:
     node = ParamDataHandler.select_data(feature_name, "ROOT")
 
@@ -51,6 +75,73 @@ def get_permission(feature_name: str, path_keys: list[str]) -> ParamPermission:
     return "ROOT"
 
 
+def get_sub_model(annotation: Any) -> tuple[type[BaseModel] | None, bool]:
+    for arg in get_args(annotation) or (annotation,):
+        if get_origin(arg) is dict:
+            return get_sub_model(get_args(arg)[1])[0], True
+        if isinstance(arg, type) and issubclass(arg, BaseModel):
+            return arg, False
+
+    return None, False
+
+
+def get_user_model(path_keys: list[str]) -> tuple[type[BaseModel], int]:
+    # Returns the deepest user model enclosing the path and the index of the
+    # path key that is a field of this model.
+    model, index = user_FeatureParams, 0
+
+    while index < len(path_keys) - 1:
+        field = model.model_fields.get(path_keys[index])
+
+        if not field:
+            break
+
+        sub_model, is_keyed = get_sub_model(field.annotation)
+        next_index = index + (2 if is_keyed else 1)
+
+        if not sub_model or next_index >= len(path_keys):
+            break
+
+        model, index = sub_model, next_index
+
+    return model, index
+
+
+def validate_values(paths_keys: list[list[str]], values: list[Any]) -> list[Any]:
+    # Values enclosed by the same model instance are validated together.
+    groups: dict[tuple, tuple[type[BaseModel], dict]] = {}
+    locations: list[tuple[tuple, list[str]]] = []
+
+    for path_keys, value in zip(paths_keys, values):
+        model, index = get_user_model(path_keys)
+        loc_prefix = tuple(path_keys[:index])
+        _, fields = groups.setdefault(loc_prefix, (model, {}))
+        node = fields
+
+        for key in path_keys[index:-1]:
+            node = node.setdefault(key, {})
+
+        node[path_keys[-1]] = value
+        locations.append((loc_prefix, path_keys[index:]))
+
+    model_dicts: dict[tuple, dict] = {}
+
+    for loc_prefix, (model, fields) in groups.items():
+        try:
+            model_dicts[loc_prefix] = model(**fields).model_dump(exclude_none=True)
+        except ValidationError as validation_error:
+            raise ParamsValidationError(
+                title="Validation error",
+                validation_error=validation_error,
+                loc_prefix=loc_prefix,
+            )
+
+    return [
+        get_dict(model_dicts[loc_prefix], field_keys)
+        for loc_prefix, field_keys in locations
+    ]
+
+
 def is_value(path_keys: str) -> bool:
     value = get_dict(user_FeatureParams_dict.get_structure(), path_keys)
     if isinstance(value, dict):
@@ -58,8 +149,23 @@ def is_value(path_keys: str) -> bool:
     return True
 
 
+def flatten_values(node: dict, path_keys: list[str] = []) -> dict[str, Any]:
+    values: dict[str, Any] = {}
+
+    for key, value in node.items():
+        sub_keys = [*path_keys, key]
+
+        if isinstance(value, dict) and not is_value(sub_keys):
+            values.update(flatten_values(value, sub_keys))
+        else:
+            values[".".join(sub_keys)] = value
+
+    return values
+
+
 class ParamDataHandler:
     __data_dict: dict[str, ParamData] = {}
+    __watchers: dict[str, ParamsWatcher] = {}
 
     @staticmethod
     def add_param_data(feature_name: str, param_data: ParamData):
@@ -67,31 +173,41 @@ class ParamDataHandler:
 
     @staticmethod
     def remove_param_data(feature_name: str):
+        ParamDataHandler.unwatch_params(feature_name)
+
+        # A feature loaded again reads its user params from the file.
+        ParamsPersister.flush(feature_name)
+
         if feature_name in ParamDataHandler.__data_dict:
             ParamDataHandler.__data_dict.pop(feature_name)
 
     @staticmethod
     def add_param_listener(path: str, listener: Callable[[str, Any], None]):
-        feature_name, _ = break_path(path)
-        param_listeners = ParamDataHandler.__data_dict[feature_name].param_listeners
-        listeners = param_listeners.get(path)
-
-        if listeners:
-            listeners.append(listener)
-        else:
-            param_listeners[path] = [listener]
+        feature_name, _ = split_path(path)
+        ParamDataHandler.__data_dict[feature_name].param_listeners.add(path, listener)
 
     @staticmethod
     def remove_param_listener(path: str, listener: Callable[[str, Any], None]):
-        feature_name, _ = break_path(path)
-        param_listeners = ParamDataHandler.__data_dict[feature_name].param_listeners
-        listeners = param_listeners.get(path)
+        feature_name, _ = split_path(path)
+        ParamDataHandler.__data_dict[feature_name].param_listeners.remove(
+            path, listener
+        )
 
-        if listeners:
-            listeners.remove(listener)
+    @staticmethod
+    def add_param_batch_listener(path: str, listener: Callable[[dict[str, Any]], None]):
+        feature_name, _ = split_path(path)
+        ParamDataHandler.__data_dict[feature_name].param_batch_listeners.add(
+            path, listener
+        )
 
-            if len(listeners) == 0:
-                param_listeners.pop(path)
+    @staticmethod
+    def remove_param_batch_listener(
+        path: str, listener: Callable[[dict[str, Any]], None]
+    ):
+        feature_name, _ = split_path(path)
+        ParamDataHandler.__data_dict[feature_name].param_batch_listeners.remove(
+            path, listener
+        )
 
     @staticmethod
     def select_data(
@@ -99,14 +215,26 @@ class ParamDataHandler:
     ) -> root_FeatureParams_dict | user_FeatureParams_dict:
         return getattr(ParamDataHandler.__data_dict[feature_name], type.lower())
 
+    @staticmethod
+    def __get_entry(path: str) -> ParamIndexEntry | None:
+        feature_name, param_path = split_path(path)
+        return ParamDataHandler.__data_dict[feature_name].index.get(param_path)
+
     @staticmethod
     def node_is_define(path: str) -> bool:
         feature_name, path_keys = break_path(path)
+        entry = ParamDataHandler.__get_entry(path)
 
-        if is_value(path_keys):
-            raise ParamPermissionError(path, "VALUE")
+        if entry:
+            if entry.kind == "VALUE":
+                raise ParamPermissionError(path, "VALUE")
 
-        permission = get_permission(feature_name, path_keys)
+            permission = entry.permission
+        else:
+            if is_value(path_keys):
+                raise ParamPermissionError(path, "VALUE")
+
+            permission = get_permission(feature_name, path_keys)
 
         if permission == "DISABLED":
             return False
@@ -127,9 +255,9 @@ class ParamDataHandler:
 
     @staticmethod
     def get_frame_ids(feature_name: str) -> list[str]:
-        permission = get_permission(feature_name, ["frames"])
+        entry = ParamDataHandler.__data_dict[feature_name].index.get("frames")
 
-        if permission == "DISABLED":
+        if entry.permission == "DISABLED":
             return []
 
         return list(
@@ -138,6 +266,38 @@ class ParamDataHandler:
             ).keys()
         )
 
+    @staticmethod
+    def get_frame_snapshot(feature_name: str, frame_id: str) -> FrameParamsSnapshot:
+        param_data = ParamDataHandler.__data_dict[feature_name]
+        snapshot = param_data.frame_snapshots.get(frame_id)
+
+        if snapshot:
+            return snapshot
+
+        if not frame_id in ParamDataHandler.get_frame_ids(feature_name):
+            raise ValueError(f"Frame ID '{frame_id}' does not exist")
+
+        frame_path = f"{feature_name}.frames.{frame_id}"
+        values: dict[str, Any] = {}
+        nodes: dict[str, bool] = {}
+
+        for param_path, entry in param_data.index.get_frame_entries(frame_id).items():
+            if entry.kind == "VALUE":
+                values[param_path] = entry.value
+            else:
+                nodes[param_path] = ParamDataHandler.node_is_define(
+                    f"{frame_path}.{param_path}"
+                )
+
+        # Root only fields (name, route, life_cycle...) are not indexed.
+        for key in param_data.root["frames"][frame_id].keys():
+            if not key in values and not key in nodes:
+                values[key] = ParamDataHandler.get_value(f"{frame_path}.{key}")
+
+        snapshot = FrameParamsSnapshot(frame_id, values, nodes)
+        param_data.frame_snapshots[frame_id] = snapshot
+        return snapshot
+
     @staticmethod
     def get_user_dir(feature_name: str):
         user_filepath = ParamDataHandler.__data_dict[feature_name].user_filepath
@@ -145,11 +305,146 @@ class ParamDataHandler:
 
     @staticmethod
     def save_params(feature_name: str):
+        # The params are written behind, the user dict is replaced (never
+        # mutated) on changes so the latest one is read when flushing.
         data = ParamDataHandler.__data_dict[feature_name]
-        write_json(data.user_filepath, data.user)
+        ParamsPersister.schedule(feature_name, data.user_filepath, lambda: data.user)
+
+    @staticmethod
+    def flush_params(feature_name: str = None):
+        ParamsPersister.flush(feature_name)
+
+    @staticmethod
+    def stop_persister():
+        ParamsPersister.stop()
+
+    @staticmethod
+    def get_save_stats(feature_name: str) -> ParamsPersisterStats:
+        return ParamsPersister.get_stats(feature_name)
+
+    @staticmethod
+    def watch_params(
+        feature_name: str,
+        schedule: Callable[[Callable[[], None]], None] = None,
+    ):
+        # External edits are applied through 'schedule', on the thread owning
+        # the params (the watcher thread when none is given).
+        ParamDataHandler.unwatch_params(feature_name)
+
+        def apply(user_params_dict: user_FeatureParams_dict):
+            # The feature may have been unloaded since the change was scheduled.
+            if ParamDataHandler.__watchers.get(feature_name) is not watcher:
+                return
+
+            try:
+                ParamDataHandler.apply_user_params(feature_name, user_params_dict)
+            except Exception as exception:
+                Logger.log_exception(exception)
+
+        def on_change(user_params_dict: user_FeatureParams_dict):
+            if schedule:
+                schedule(lambda: apply(user_params_dict))
+            else:
+                apply(user_params_dict)
+
+        watcher = ParamsWatcher(
+            ParamDataHandler.__data_dict[feature_name].user_filepath, on_change
+        )
+        ParamDataHandler.__watchers[feature_name] = watcher
+        watcher.start()
+
+    @staticmethod
+    def unwatch_params(feature_name: str = None):
+        feature_names = (
+            list(ParamDataHandler.__watchers)
+            if feature_name is None
+            else [feature_name]
+        )
+
+        for feature_name in feature_names:
+            watcher = ParamDataHandler.__watchers.pop(feature_name, None)
+
+            if watcher:
+                watcher.stop()
+
+    @staticmethod
+    def apply_user_params(
+        feature_name: str, user_params_dict: user_FeatureParams_dict
+    ) -> bool:
+        # Applies an external edit of the user params file: only the values
+        # that differ from the current user params are set.
+        if not isinstance(user_params_dict, dict):
+            Logger.log(
+                f"[{feature_name}]: user parameters must be an object", "WARNING"
+            )
+            return False
+
+        # Our own saves are written from the current user params.
+        if user_params_dict == ParamsPersister.get_written(feature_name):
+            return True
+
+        param_data = ParamDataHandler.__data_dict[feature_name]
+        current_values = flatten_values(param_data.user)
+        new_values = flatten_values(user_params_dict)
+        frame_ids = ParamDataHandler.get_frame_ids(feature_name)
+        changes: dict[str, Any] = {}
+        frame_changes: dict[str, None] = {}
+
+        for param_path in {**current_values, **new_values}.keys():
+            value = new_values.get(param_path)
+
+            if value == current_values.get(param_path):
+                continue
+
+            # Frames are updated in place, creating or removing them (or
+            # changing their template) requires a reload.
+            path_keys = param_path.split(".")
+
+            if path_keys[0] == "frames" and (
+                len(path_keys) < 3
+                or not path_keys[1] in frame_ids
+                or path_keys[2] == "template"
+            ):
+                frame_changes[path_keys[1] if len(path_keys) > 1 else ""] = None
+                continue
+
+            try:
+                ParamDataHandler.__check_value(f"{feature_name}.{param_path}", value)
+            except ParamPermissionError as exception:
+                Logger.log(f"[{feature_name}]: {exception}", "WARNING")
+                continue
+
+            changes[param_path] = value
+
+        if frame_changes:
+            Logger.log(
+                f"[{feature_name}]: frame changes ignored until the feature is reloaded: {', '.join(frame_changes)}",
+                "WARNING",
+            )
+
+        try:
+            ParamDataHandler.set_values(feature_name, changes)
+        except ParamsValueError as exception:
+            Logger.log(f"[{feature_name}]: {exception}", "WARNING")
+            return False
+
+        if changes:
+            Logger.log(f"[{feature_name}]: user parameters updated from file")
+
+        return True
 
     @staticmethod
     def get_value(path: str) -> Any | None:
+        entry = ParamDataHandler.__get_entry(path)
+
+        if entry:
+            if entry.kind == "NODE":
+                raise ParamPermissionError(path, "NODE")
+
+            return entry.value
+
+        # Paths that are not indexed (e.g. frames that do not exist) keep
+        # being resolved from the parameters.
         feature_name, path_keys = break_path(path)
 
         if not is_value(path_keys):
@@ -176,38 +471,71 @@ class ParamDataHandler:
             )
 
     @staticmethod
-    def set_value(path: str, value: Any) -> None:
+    def __check_value(path: str, value: Any):
         feature_name, path_keys = break_path(path)
+        entry = ParamDataHandler.__get_entry(path)
 
-        if not is_value(path_keys):
-            raise ParamPermissionError(path, "NODE")
+        if entry:
+            if entry.kind == "NODE":
+                raise ParamPermissionError(path, "NODE")
 
-        permission = get_permission(feature_name, path_keys)
+            permission = entry.permission
+        else:
+            if not is_value(path_keys):
+                raise ParamPermissionError(path, "NODE")
+
+            permission = get_permission(feature_name, path_keys)
 
         if permission in ["DISABLED", "ROOT"]:
             raise ParamPermissionError(path, permission)
 
-        if permission == "RESTRICTED":
+        if permission == "RESTRICTED" and value is not None:
             if not value in get_dict(
                 ParamDataHandler.select_data(feature_name, "ROOT"), path_keys
             ):
                 raise ParamPermissionError(path, permission)
 
-        user_dict = copy.deepcopy(ParamDataHandler.__data_dict[feature_name].user)
-        set_dict(user_dict, path_keys, value)
+    @staticmethod
+    def __apply_values(feature_name: str, values: dict[str, Any]):
+        paths = [f"{feature_name}.{param_path}" for param_path in values.keys()]
 
-        try:
-            ParamDataHandler.__data_dict[feature_name].user = user_FeatureParams(
-                **user_dict
-            ).model_dump(exclude_none=True)
+        for path, value in zip(paths, values.values()):
+            ParamDataHandler.__check_value(path, value)
 
-            ParamDataHandler.__handle_listeners(path, value)
+        # Only the models enclosing the values are validated, the user params
+        # are updated once every value is valid.
+        paths_keys = [param_path.split(".") for param_path in values.keys()]
+        valid_values = validate_values(paths_keys, list(values.values()))
 
-        except ValidationError as validation_error:
-            raise ParamsValidationError(
-                title="Validation error",
-                validation_error=validation_error,
-            )
+        param_data = ParamDataHandler.__data_dict[feature_name]
+        user_dict = param_data.user
+
+        for path_keys, value in zip(paths_keys, valid_values):
+            user_dict = copy_set_dict(user_dict, path_keys, value)
+
+        param_data.user = user_dict
+
+        for param_path, path_keys in zip(values.keys(), paths_keys):
+            param_data.index.update_value(param_path, user_dict)
+
+            if len(path_keys) > 1 and path_keys[0] == "frames":
+                param_data.frame_snapshots.pop(path_keys[1], None)
+
+        return dict(zip(paths, values.values()))
+
+    @staticmethod
+    def set_value(path: str, value: Any) -> None:
+        feature_name, param_path = split_path(path)
+        ParamDataHandler.__apply_values(feature_name, {param_path: value})
+        ParamDataHandler.__handle_listeners({path: value})
+
+    @staticmethod
+    def set_values(feature_name: str, values: dict[str, Any]) -> None:
+        if not values:
+            return
+
+        changes = ParamDataHandler.__apply_values(feature_name, values)
+        ParamDataHandler.__handle_listeners(changes)
 
     @staticmethod
     def new_frame_from_template(
@@ -222,6 +550,19 @@ class ParamDataHandler:
             Logger.log(str(exception), "WARNING")
             return False
 
+    @staticmethod
+    def new_frames_from_template(
+        feature_name: str, frames_params_dict: dict[str, user_FrameParams_dict]
+    ) -> bool:
+        try:
+            ParamDataHandler.__data_dict[feature_name].create_frames_from_template(
+                frames_params_dict
+            )
+            return True
+        except Exception as exception:
+            Logger.log(str(exception), "WARNING")
+            return False
+
     @staticmethod
     def remove_frame_from_template(feature_name: str, frame_id: str) -> bool:
         try:
@@ -234,13 +575,34 @@ class ParamDataHandler:
             return False
 
     @staticmethod
-    def __handle_listeners(path: str, value: Any):
-        feature_name, _ = break_path(path)
-        param_listeners = ParamDataHandler.__data_dict[feature_name].param_listeners
-
-        for key in param_listeners.keys():
-            if path.startswith(key):
-                listeners = param_listeners[key]
+    def remove_frames_from_template(feature_name: str, frame_ids: list[str]) -> bool:
+        try:
+            ParamDataHandler.__data_dict[feature_name].remove_frames_from_template(
+                frame_ids
+            )
+            return True
+        except Exception as exception:
+            Logger.log(str(exception), "WARNING")
+            return False
 
+    @staticmethod
+    def __handle_listeners(changes: dict[str, Any]):
+        feature_name, _ = split_path(next(iter(changes)))
+        param_data = ParamDataHandler.__data_dict[feature_name]
+        batches: dict[str, tuple[list[Callable], dict[str, Any]]] = {}
+
+        # Param listeners are called for each changed value, batch listeners
+        # once with the changes under their path.
+        for path, value in changes.items():
+            for _, listeners in param_data.param_listeners.match(path):
                 for listener in listeners:
                     listener(path, value)
+
+            for listener_path, listeners in param_data.param_batch_listeners.match(
+                path
+            ):
+                batches.setdefault(listener_path, (listeners, {}))[1][path] = value
+
+        for listeners, listener_changes in batches.values():
+            for listener in listeners:
+                listener(listener_changes)
@@ -31,14 +31,15 @@ class LayerFrame(Frame):
         layerise_frame(self)
         set_layer_frame(self)
 
-        def on_layer_frame_params_changes(path: str, value):
+        # One re-layout per batch of changes, from the current snapshot.
+        def on_layer_frame_params_changes(changes: dict):
             GLib.idle_add(lambda: set_layer_frame(self))
 
-        self.params.add_listener("layer_frame", on_layer_frame_params_changes)
+        self.params.add_batch_listener("layer_frame", on_layer_frame_params_changes)
 
         self.connect(
             "destroy",
-            lambda w: self.params.remove_listener(
+            lambda w: self.params.remove_batch_listener(
                 "layer_frame", on_layer_frame_params_changes
             ),
         )
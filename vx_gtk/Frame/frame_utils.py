@@ -1,14 +1,14 @@
 from vx_types import LifeCycleHandler, LifeCycleCleanUpHandler
-from vx_features import ParamDataHandler
+from vx_features import ParamDataHandler, FrameParamsSnapshot
 from vx_logger import Logger
 from typing import Callable, Any
 from ..Gtk_imports import Gtk, Gdk
 
 
 def handle_frame_startup(feature_name: str, frame_id: str):
-    startup_handler: LifeCycleHandler = ParamDataHandler.get_value(
-        f"{feature_name}.frames.{frame_id}.life_cycle"
-    )
+    startup_handler: LifeCycleHandler = ParamDataHandler.get_frame_snapshot(
+        feature_name, frame_id
+    )("life_cycle")
 
     if startup_handler is None:
         return
@@ -39,12 +39,28 @@ def handle_frame_cleanup(cleanup_handler: LifeCycleCleanUpHandler | None):
 
 class FrameParams:
     def __init__(self, feature_name: str, frame_id: str):
+        self.__feature_name = feature_name
+        self.__frame_id = frame_id
         self.__main_path = f"{feature_name}.frames.{frame_id}"
 
+    @property
+    def snapshot(self) -> FrameParamsSnapshot:
+        return ParamDataHandler.get_frame_snapshot(self.__feature_name, self.__frame_id)
+
     def __call__(self, path: str):
+        snapshot = self.snapshot
+
+        if path in snapshot:
+            return snapshot[path]
+
         return ParamDataHandler.get_value(f"{self.__main_path}.{path}")
 
     def node_is_define(self, path: str):
+        snapshot = self.snapshot
+
+        if path in snapshot.nodes:
+            return snapshot.node_is_define(path)
+
         return ParamDataHandler.node_is_define(f"{self.__main_path}.{path}")
 
     def add_listener(self, path: str, listener: Callable[[str, Any], None]):
@@ -57,6 +73,18 @@ class FrameParams:
             f"{self.__main_path}.{path}", listener
         )
 
+    def add_batch_listener(self, path: str, listener: Callable[[dict[str, Any]], None]):
+        return ParamDataHandler.add_param_batch_listener(
+            f"{self.__main_path}.{path}", listener
+        )
+
+    def remove_batch_listener(
+        self, path: str, listener: Callable[[dict[str, Any]], None]
+    ):
+        return ParamDataHandler.remove_param_batch_listener(
+            f"{self.__main_path}.{path}", listener
+        )
+
 
 def set_frame_as_transparent(frame: Gtk.Window):
     screen = frame.get_screen()
@@ -1,5 +1,6 @@
 from vx_types import LevelKeys, AnchorEdgeKeys, AlignmentKeys
 from vx_gtk import Gtk
+from vx_features import FrameParamsSnapshot
 from .frame_utils import FrameParams
 from ..layerise import Edges, Levels, Margins, layerise_window, set_layer
 
@@ -43,7 +44,7 @@ def set_anchor_edges(
     return anchor_key_values.get(f"{anchor_edge_key}_{alignment_key}")
 
 
-def set_margins(params: FrameParams):
+def set_margins(params: FrameParamsSnapshot):
     if params.node_is_define("layer_frame.margins"):
         return Margins(
             params("layer_frame.margins.top"),
@@ -64,7 +65,7 @@ def layerise_frame(frame: Gtk.Window):
 
 
 def set_layer_frame(frame: Gtk.Window):
-    params: FrameParams = frame.params
+    params: FrameParamsSnapshot = frame.params.snapshot
 
     frame.set_size_request(
         params("layer_frame.width") or -1,
@@ -68,6 +68,21 @@ class FeatureFrameHandler:
 
         GLib.idle_add(process)
 
+    def __destroy_frames(self, frame_ids: list[str]):
+        # Waits for the frames to be destroyed, as they read their params
+        # until then.
+        is_done = ThreadEvent()
+
+        def process():
+            for frame_id in frame_ids:
+                if self.is_open(frame_id):
+                    self.frames[frame_id].destroy()
+
+            is_done.set()
+
+        GLib.idle_add(process)
+        is_done.wait()
+
     def new_frame_from_template(
         self, frame_id: str, frame_params_dict: user_FrameParams_dict
     ) -> bool:
@@ -88,15 +103,39 @@ class FeatureFrameHandler:
         if not self.exists(frame_id):
             return
 
-        result = ParamDataHandler.remove_frame_from_template(
-            self.feature_name, frame_id
+        # Open frames are closed before their params are removed.
+        self.__destroy_frames([frame_id])
+
+        return ParamDataHandler.remove_frame_from_template(self.feature_name, frame_id)
+
+    def new_frames_from_template(
+        self, frames_params_dict: dict[str, user_FrameParams_dict]
+    ) -> bool:
+        if any(self.exists(frame_id) for frame_id in frames_params_dict.keys()):
+            return False
+
+        result = ParamDataHandler.new_frames_from_template(
+            self.feature_name, frames_params_dict
         )
 
-        if result and self.is_open(frame_id):
-            self.close_frame(frame_id)
+        if result:
+            for frame_id in frames_params_dict.keys():
+                if self.frame_params(frame_id, "show_on_startup"):
+                    self.open(frame_id)
 
         return result
 
+    def remove_frames_from_template(self, frame_ids: list[str]) -> bool:
+        if not all(self.exists(frame_id) for frame_id in frame_ids):
+            return False
+
+        # Open frames are closed before their params are removed.
+        self.__destroy_frames(frame_ids)
+
+        return ParamDataHandler.remove_frames_from_template(
+            self.feature_name, frame_ids
+        )
+
     def popup_context_menu(self, frame_id: str, menu: Gtk.Menu):
         if not self.exists(frame_id) or not self.is_open(frame_id):
             return
@@ -157,6 +196,20 @@ class FrameHandler:
     def remove_frame_from_template(feature_name: str, frame_id: str) -> bool:
         return FrameHandler.__frames[feature_name].remove_frame_from_template(frame_id)
 
+    @staticmethod
+    def new_frames_from_template(
+        feature_name: str, frames_params_dict: dict[str, user_FrameParams_dict]
+    ) -> bool:
+        return FrameHandler.__frames[feature_name].new_frames_from_template(
+            frames_params_dict
+        )
+
+    @staticmethod
+    def remove_frames_from_template(feature_name: str, frame_ids: list[str]) -> bool:
+        return FrameHandler.__frames[feature_name].remove_frames_from_template(
+            frame_ids
+        )
+
     @staticmethod
     def popup_context_menu(feature_name: str, frame_id: str, menu: Gtk.Menu):
         return FrameHandler.__frames[feature_name].popup_context_menu(frame_id, menu)
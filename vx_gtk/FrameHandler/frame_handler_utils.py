@@ -11,4 +11,9 @@ class FeatureFrameParams:
         return ParamDataHandler.get_frame_ids(self.__feature_name)
 
     def __call__(self, frame_id: str, path: str):
+        snapshot = ParamDataHandler.get_frame_snapshot(self.__feature_name, frame_id)
+
+        if path in snapshot:
+            return snapshot[path]
+
         return ParamDataHandler.get_value(f"{self.__main_path}.{frame_id}.{path}")
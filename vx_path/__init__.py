@@ -1,4 +1,5 @@
 import os
+from .utils import write_json
 
 
 class VxPath:
@@ -24,5 +25,6 @@ class VxPath:
 
     VX_SETUP_FILE: str = f"{ROOT_CONFIG}/vixen_setup.json"
     VX_CONFIG_FILE: str = f"{USER_CONFIG}/vixen.json"
+    VX_STATE_JOURNAL_FILE: str = f"{USER_CONFIG}/vixen.journal"
 
     DESKTOP_ENTRIES: str = "/usr/share/applications"
@@ -0,0 +1,53 @@
+import os, json, tempfile
+
+
+def write_json(file_path: str, data: dict):
+    # The data is written to a temporary file of the same directory which
+    # then replaces the original one, so a crash never leaves a truncated file.
+    dir_path = os.path.dirname(file_path) or "."
+    file_descriptor, temp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", dir=dir_path
+    )
+
+    try:
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+
+        if os.path.exists(file_path):
+            os.chmod(temp_path, os.stat(file_path).st_mode & 0o777)
+        else:
+            os.chmod(temp_path, 0o666 & ~UMASK)
+
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    dir_descriptor = os.open(dir_path, os.O_RDONLY)
+
+    try:
+        os.fsync(dir_descriptor)
+    finally:
+        os.close(dir_descriptor)
+
+
+def read_umask() -> int:
+    # Setting the umask is process wide, it is read from /proc when possible
+    # and only once, before other threads create files.
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+UMASK = read_umask()
@@ -8,16 +8,23 @@ class StateItem(TypedDict):
 
 class State:
     @staticmethod
-    def add_listener(listener: Callable[[StateItem], None]) -> None:
+    def add_listener(
+        listener: Callable[[StateItem], None], keys: list[str] = None
+    ) -> None:
+        # Sync listeners are called one at a time, in order, on a single
+        # dedicated thread (never the one setting the state), coroutine
+        # functions on the API loop.
         from vx_config import VxConfig
 
-        return VxConfig.add_state_listener(listener)
+        return VxConfig.add_state_listener(listener, keys)
 
     @staticmethod
-    def remove_listener(listener: Callable[[StateItem], None]) -> None:
+    def remove_listener(
+        listener: Callable[[StateItem], None], keys: list[str] = None
+    ) -> None:
         from vx_config import VxConfig
 
-        return VxConfig.remove_state_listener(listener)
+        return VxConfig.remove_state_listener(listener, keys)
 
     @staticmethod
     def get(key: str) -> Any:
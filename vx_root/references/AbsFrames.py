@@ -29,6 +29,14 @@ class AbsFrames(ABC):
     def remove_from_template(self, id: str) -> bool:
         pass
 
+    @abstractmethod
+    def new_from_templates(self, frames: dict[str, user_FrameParams_dict]) -> bool:
+        pass
+
+    @abstractmethod
+    def remove_from_templates(self, ids: list[str]) -> bool:
+        pass
+
 
 def get_frames_reference(feature):
     class FramesReference(AbsFrames):
@@ -54,4 +62,10 @@ def get_frames_reference(feature):
         def remove_from_template(self, id: str) -> bool:
             return feature.remove_frame_from_template(id)
 
+        def new_from_templates(self, frames: dict[str, user_FrameParams_dict]) -> bool:
+            return feature.new_frames_from_template(frames)
+
+        def remove_from_templates(self, ids: list[str]) -> bool:
+            return feature.remove_frames_from_template(ids)
+
     return FramesReference()
@@ -15,6 +15,18 @@ class AbsParams(ABC):
     ) -> None:
         pass
 
+    @abstractmethod
+    def add_param_batch_listener(
+        self, param_path: str, listener: Callable[[dict[str, Any]], None]
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def remove_param_batch_listener(
+        self, param_path: str, listener: Callable[[dict[str, Any]], None]
+    ) -> None:
+        pass
+
     @abstractmethod
     def node_is_define(self, node_path: str) -> bool:
         pass
@@ -31,6 +43,10 @@ class AbsParams(ABC):
     def set_value(self, param_path: str, value: Any) -> None:
         pass
 
+    @abstractmethod
+    def set_values(self, values: dict[str, Any]) -> None:
+        pass
+
 
 def get_params_reference(feature_name: str, ParamDataHandler):
     class ParamHandlerReference(AbsParams):
@@ -46,6 +62,18 @@ def get_params_reference(feature_name: str, ParamDataHandler):
             path = f"{feature_name}.{param_path}"
             ParamDataHandler.remove_param_listener(path, listener)
 
+        def add_param_batch_listener(
+            self, param_path: str, listener: Callable[[dict[str, Any]], None]
+        ) -> None:
+            path = f"{feature_name}.{param_path}"
+            ParamDataHandler.add_param_batch_listener(path, listener)
+
+        def remove_param_batch_listener(
+            self, param_path: str, listener: Callable[[dict[str, Any]], None]
+        ) -> None:
+            path = f"{feature_name}.{param_path}"
+            ParamDataHandler.remove_param_batch_listener(path, listener)
+
         def node_is_define(self, node_path: str) -> bool:
             path = f"{feature_name}.{node_path}"
             return ParamDataHandler.node_is_define(path)
@@ -61,4 +89,7 @@ def get_params_reference(feature_name: str, ParamDataHandler):
             path = f"{feature_name}.{param_path}"
             ParamDataHandler.set_value(path, value)
 
+        def set_values(self, values: dict[str, Any]) -> None:
+            ParamDataHandler.set_values(feature_name, values)
+
     return ParamHandlerReference()
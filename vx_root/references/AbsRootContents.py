@@ -2,12 +2,19 @@ from inspect import stack, getmodule
 from abc import ABC, abstractmethod
 from typing import Callable
 from vx_types import FeatureContentType
+from vx_features.ContentCache import ContentCacheOptions
 
 
 class AbsRootContents(ABC):
     @abstractmethod
     def dispatch(
-        self, content_type: FeatureContentType, name: str = None
+        self,
+        content_type: FeatureContentType,
+        name: str = None,
+        timeout: float | None = None,
+        cache: ContentCacheOptions | None = None,
+        source: bool = False,
+        current: Callable | None = None,
     ) -> Callable[[Callable], Callable]:
         pass
 
@@ -19,6 +26,10 @@ class AbsRootContents(ABC):
     def exists(self, content_type: FeatureContentType, name: str) -> bool:
         pass
 
+    @abstractmethod
+    def invalidate(self, name: str, args: list | None = None) -> None:
+        pass
+
 
 def get_root_contents_reference(root_contents):
     def restricted(contents_name: str = None):
@@ -48,9 +59,17 @@ def get_root_contents_reference(root_contents):
     class RootContentsReference(AbsRootContents):
         @restricted(root_contents.name)
         def dispatch(
-            self, content_type: FeatureContentType, name: str = None
+            self,
+            content_type: FeatureContentType,
+            name: str = None,
+            timeout: float | None = None,
+            cache: ContentCacheOptions | None = None,
+            source: bool = False,
+            current: Callable | None = None,
         ) -> Callable[[Callable], Callable]:
-            return root_contents.dispatch(content_type, name)
+            return root_contents.dispatch(
+                content_type, name, timeout, cache, source, current
+            )
 
         @restricted(root_contents.name)
         def undispatch(self, content_type: FeatureContentType, name: str) -> None:
@@ -60,4 +79,8 @@ def get_root_contents_reference(root_contents):
         def exists(self, content_type: FeatureContentType, name: str) -> bool:
             return root_contents.exists(content_type, name)
 
+        @restricted(root_contents.name)
+        def invalidate(self, name: str, args: list | None = None) -> None:
+            return root_contents.invalidate(name, args)
+
     return RootContentsReference()
@@ -6,7 +6,7 @@ Description       : vixen shell api library.
 License           : GPL3
 """
 
-from .servers import AsyncLoop
+from .servers import AsyncLoop, SocketQueue
 
 
 def run_shell():
@@ -1,12 +1,14 @@
-from fastapi import Response, Path, Body
+from fastapi import Response, Path, Body, WebSocket
 from pydantic import BaseModel, ConfigDict
 from typing import Any
 from vx_features import ParamDataHandler, RootContents
-from vx_logger import Logger
 from vx_gtk import ContextMenuHandler
 from ..api import api
 from ..models import ModelResponses, Models
 from ...features import Features
+from ...servers import SocketQueue
+from ...features.DataHandler import DataHandler
+from ...features.ActionHandler import ActionHandler
 
 
 # ---------------------------------------------- - - -
@@ -162,6 +164,53 @@ async def set_feature_param(
     )
 
 
+# ---------------------------------------------- - - -
+# FEATURE SET PARAMS
+#
+
+set_params_responses = ModelResponses(
+    {200: dict, 404: Models.Commons.Error, 409: Models.Commons.Error}
+)
+
+
+class SetParamsData(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    values: dict[str, Any]
+
+
+@api.post(
+    "/feature/{feature_name}/set_params",
+    description="Set several feature params at once",
+    responses=set_params_responses.responses,
+)
+async def set_feature_params(
+    response: Response,
+    feature_name: str = Path(description="Feature name"),
+    params_data: SetParamsData = Body(description="Param values by param path"),
+):
+    if not Features.exists(feature_name):
+        return set_params_responses(response, 404)(
+            message=f"Feature '{feature_name}' not found"
+        )
+
+    feature = Features.get(feature_name)
+
+    if not feature.is_started:
+        return set_params_responses(response, 409)(
+            message=f"Feature '{feature_name}' is not started"
+        )
+
+    try:
+        ParamDataHandler.set_values(feature_name, params_data.values)
+    except Exception as exception:
+        return set_params_responses(response, 409)(message=str(exception))
+
+    return set_params_responses(response, 200)(
+        {"feature_name": feature_name, **params_data.values}
+    )
+
+
 # ---------------------------------------------- - - -
 # FEATURE SAVE PARAMS
 #
@@ -200,6 +249,32 @@ async def save_feature_params(
     return save_params_responses(response, 200)({"feature_name": feature_name})
 
 
+# ---------------------------------------------- - - -
+# FEATURE SAVE PARAMS STATS
+#
+
+save_params_stats_responses = ModelResponses({200: dict, 404: Models.Commons.Error})
+
+
+@api.get(
+    "/feature/{feature_name}/save_params/stats",
+    description="Get the pending and last flush stats of the feature params saves",
+    responses=save_params_stats_responses.responses,
+)
+async def save_feature_params_stats(
+    response: Response,
+    feature_name: str = Path(description="Feature name"),
+):
+    if not Features.exists(feature_name):
+        return save_params_stats_responses(response, 404)(
+            message=f"Feature '{feature_name}' not found"
+        )
+
+    return save_params_stats_responses(response, 200)(
+        {"feature_name": feature_name, **ParamDataHandler.get_save_stats(feature_name)}
+    )
+
+
 # ---------------------------------------------- - - -
 # FEATURE DATA
 #
@@ -221,20 +296,6 @@ class DataHandlerModel(BaseModel):
     handler_args: list = []
 
 
-class DataHandler:
-    def __init__(self, data_name: str, handler, handler_args: list = []):
-        self.data_name = data_name
-        self.handler = handler
-        self.handler_args = handler_args
-
-    def get_data(self):
-        try:
-            return self.handler(*self.handler_args)
-        except Exception as exception:
-            Logger.log_exception(exception)
-            raise exception
-
-
 @api.post(
     "/feature/{feature_name}/data",
     description="Get a feature data",
@@ -255,7 +316,8 @@ async def get_data(
     try:
         handler = DataHandler(
             data_handler.data_name,
-            feature.contents.get("data", data_handler.handler_name),
+            data_handler.handler_name,
+            feature.contents,
             data_handler.handler_args,
         )
     except KeyError as key_error:
@@ -268,13 +330,129 @@ async def get_data(
     data = {}
 
     try:
-        data[handler.data_name] = handler.get_data()
+        data[handler.data_name] = await handler.get_data()
     except Exception as exception:
         return feature_data_responses(response, 409)(message=str(exception))
 
     return feature_data_responses(response, 200)(**data)
 
 
+# ---------------------------------------------- - - -
+# FEATURE DATA STREAMER STATS
+#
+
+data_streamer_stats_responses = ModelResponses(
+    {200: dict, 404: Models.Commons.Error, 409: Models.Commons.Error}
+)
+
+
+@api.get(
+    "/feature/{feature_name}/data_streamer/stats",
+    description="Get the timing stats of the feature data streams",
+    responses=data_streamer_stats_responses.responses,
+)
+async def data_streamer_stats(
+    response: Response,
+    feature_name: str = Path(description="Feature name"),
+):
+    if not Features.exists(feature_name):
+        return data_streamer_stats_responses(response, 404)(
+            message=f"Feature '{feature_name}' not found"
+        )
+
+    feature = Features.get(feature_name)
+
+    if not feature.is_started:
+        return data_streamer_stats_responses(response, 409)(
+            message=f"Feature '{feature_name}' is not started"
+        )
+
+    return data_streamer_stats_responses(response, 200)(
+        {"feature_name": feature_name, "streams": feature.data_streamer.stats()}
+    )
+
+
+# ---------------------------------------------- - - -
+# FEATURE DATA CACHE
+#
+
+data_cache_responses = ModelResponses(
+    {200: dict, 404: Models.Commons.Error, 409: Models.Commons.Error}
+)
+
+
+@api.get(
+    "/feature/{feature_name}/data_cache",
+    description="Get the hit and miss counters of the feature cached data handlers",
+    responses=data_cache_responses.responses,
+)
+async def data_cache(
+    response: Response,
+    feature_name: str = Path(description="Feature name"),
+):
+    if not Features.exists(feature_name):
+        return data_cache_responses(response, 404)(
+            message=f"Feature '{feature_name}' not found"
+        )
+
+    feature = Features.get(feature_name)
+
+    if not feature.is_started:
+        return data_cache_responses(response, 409)(
+            message=f"Feature '{feature_name}' is not started"
+        )
+
+    return data_cache_responses(response, 200)(
+        {"feature_name": feature_name, "caches": feature.contents.cache_metrics()}
+    )
+
+
+# ---------------------------------------------- - - -
+# FEATURE WEBSOCKETS STATS
+#
+
+websockets_stats_responses = ModelResponses(
+    {200: dict, 404: Models.Commons.Error, 409: Models.Commons.Error}
+)
+
+
+@api.get(
+    "/feature/{feature_name}/websockets/stats",
+    description="Get the outbound queue metrics of the feature websockets",
+    responses=websockets_stats_responses.responses,
+)
+async def websockets_stats(
+    response: Response,
+    feature_name: str = Path(description="Feature name"),
+):
+    if not Features.exists(feature_name):
+        return websockets_stats_responses(response, 404)(
+            message=f"Feature '{feature_name}' not found"
+        )
+
+    feature = Features.get(feature_name)
+
+    if not feature.is_started:
+        return websockets_stats_responses(response, 409)(
+            message=f"Feature '{feature_name}' is not started"
+        )
+
+    def queue_metrics(websockets: list[WebSocket]):
+        queues = [SocketQueue.get(websocket) for websocket in websockets]
+        return [queue.metrics() for queue in queues if queue]
+
+    return websockets_stats_responses(response, 200)(
+        {
+            "feature_name": feature_name,
+            "totals": SocketQueue.totals,
+            "feature": queue_metrics(feature.feature_websockets),
+            "state": queue_metrics(feature.state_websockets),
+            "frames": queue_metrics(feature.frames_websockets),
+            "systray": queue_metrics(feature.systray_websockets),
+        }
+    )
+
+
 # ---------------------------------------------- - - -
 # FEATURE ACTION NAMES
 #
@@ -320,15 +498,7 @@ class ActionHandlerModel(BaseModel):
 
     name: str
     args: list = []
-
-
-class ActionHandler:
-    def __init__(self, handler, handler_args: list = []):
-        self.handler = handler
-        self.handler_args = handler_args
-
-    def run(self):
-        return self.handler(*self.handler_args)
+    background: bool = False
 
 
 feature_action_responses = ModelResponses(
@@ -342,7 +512,10 @@ feature_action_responses = ModelResponses(
 
 @api.post(
     "/feature/{feature_name}/action",
-    description="Run a feature action",
+    description=(
+        "Run a feature action. Sync actions run one at a time, in order, "
+        "unless 'background' is set: background jobs run concurrently"
+    ),
     responses=feature_action_responses.responses,
 )
 async def get_action(
@@ -359,8 +532,7 @@ async def get_action(
 
     try:
         handler = ActionHandler(
-            feature.contents.get("task", action_handler.name),
-            action_handler.args,
+            action_handler.name, feature.contents, action_handler.args
         )
     except KeyError as key_error:
         return feature_action_responses(response, 404)(
@@ -369,8 +541,12 @@ async def get_action(
     except Exception as exception:
         return feature_action_responses(response, 409)(message=str(exception))
 
+    if action_handler.background:
+        job = handler.start_job(lambda job: feature.dispatch_job_event(job.to_dict()))
+        return feature_action_responses(response, 200)(job_id=job.job_id)
+
     try:
-        returned_data = handler.run()
+        returned_data = await handler.run()
     except Exception as exception:
         return feature_action_responses(response, 409)(message=str(exception))
 
@@ -379,6 +555,38 @@ async def get_action(
     )
 
 
+# ---------------------------------------------- - - -
+# FEATURE ACTION JOB
+#
+
+action_job_responses = ModelResponses({200: dict, 404: Models.Commons.Error})
+
+
+@api.get(
+    "/feature/{feature_name}/action/jobs/{job_id}",
+    description="Get the status, progress and result of a background feature action",
+    responses=action_job_responses.responses,
+)
+async def get_action_job(
+    response: Response,
+    feature_name: str = Path(description="Feature name"),
+    job_id: str = Path(description="Job id"),
+):
+    if not Features.exists(feature_name):
+        return action_job_responses(response, 404)(
+            message=f"Feature '{feature_name}' not found"
+        )
+
+    job = ActionHandler.get_job(job_id)
+
+    if not job or job.feature_name != feature_name:
+        return action_job_responses(response, 404)(
+            message=f"Job '{job_id}' not found in '{feature_name}' feature"
+        )
+
+    return action_job_responses(response, 200)(job.to_dict())
+
+
 # ---------------------------------------------- - - -
 # FEATURE MENU
 #
@@ -1,8 +1,10 @@
+import asyncio
 from fastapi import Response, Body
 from pydantic import BaseModel, ConfigDict
 from ..api import api
 from ..models import ModelResponses, Models
 from ...features import Features
+from ...features.DataHandler import DataHandler
 
 # ---------------------------------------------- - - -
 # FEATURE NAMES
@@ -98,3 +100,82 @@ async def unload_feature(
         )
     except KeyError as error:
         return unload_feature_responses(response, 404)(message=str(error))
+
+
+# ---------------------------------------------- - - -
+# FEATURES BATCH DATA
+#
+
+
+class BatchDataHandlerModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    feature_name: str
+    data_name: str
+    handler_name: str
+    handler_args: list = []
+
+
+batch_data_responses = ModelResponses({200: dict})
+
+
+@api.post(
+    "/features/data",
+    description="Get many feature data in one request",
+    responses=batch_data_responses.responses,
+)
+async def get_batch_data(
+    response: Response,
+    data_handlers: list[BatchDataHandlerModel] = Body(
+        description="Data handlers information"
+    ),
+):
+    data: dict[str, dict] = {}
+    errors: dict[str, dict] = {}
+    handlers: dict[tuple, DataHandler] = {}
+    entries: list[tuple[BatchDataHandlerModel, tuple]] = []
+
+    def set_error(entry: BatchDataHandlerModel, message: str):
+        errors.setdefault(entry.feature_name, {})[entry.data_name] = message
+
+    for entry in data_handlers:
+        feature = Features.get(entry.feature_name)
+
+        if not feature:
+            set_error(entry, f"Feature '{entry.feature_name}' not found")
+            continue
+
+        try:
+            handler = DataHandler(
+                entry.data_name,
+                entry.handler_name,
+                feature.contents,
+                entry.handler_args,
+            )
+        except KeyError as key_error:
+            set_error(
+                entry,
+                f"{key_error} not found in '{entry.feature_name}' feature data handlers",
+            )
+            continue
+        except Exception as exception:
+            set_error(entry, str(exception))
+            continue
+
+        key = (entry.feature_name, *handler.key)
+        handlers.setdefault(key, handler)
+        entries.append((entry, key))
+
+    values = await asyncio.gather(
+        *(handler.get_data() for handler in handlers.values()),
+        return_exceptions=True,
+    )
+    results = dict(zip(handlers.keys(), values))
+
+    for entry, key in entries:
+        if isinstance(results[key], Exception):
+            set_error(entry, str(results[key]))
+        else:
+            data.setdefault(entry.feature_name, {})[entry.data_name] = results[key]
+
+    return batch_data_responses(response, 200)({"data": data, "errors": errors})
@@ -1,7 +1,11 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from vx_systray import SysTrayObserver
+from vx_config import StateListeners
+from vx_features import ParamDataHandler
 from ..features import Features
+from ..features.DataHandler import DataHandler
+from ..features.ActionHandler import ActionHandler
 from ..servers import FrontServer
 
 
@@ -12,5 +16,10 @@ async def lifespan(api: FastAPI):
     Features.init()
     yield
     await Features.stop()
+    DataHandler.shutdown()
+    ActionHandler.shutdown()
+    StateListeners.shutdown()
+    ParamDataHandler.unwatch_params()
+    ParamDataHandler.stop_persister()
     SysTrayObserver.stop()
     FrontServer.stop()
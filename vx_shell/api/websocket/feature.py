@@ -1,14 +1,17 @@
-import asyncio, json
+import json
 from typing import TypedDict, Optional, Callable, Literal, Union
 from fastapi import WebSocket
 from fastapi.websockets import WebSocketDisconnect
-from pydantic import BaseModel, ConfigDict, ValidationError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 from vx_config import VxConfig
 from vx_systray import SysTrayState
 from vx_logger import Logger
 from vx_root import SocketHandler
+from vx_features import ParamDataHandler
 from ..api import api
 from ...features import Features
+from ...features.ParamsSubscriber import ParamsSubscriber
+from ...servers import SocketQueue
 
 
 class OutputEvent(TypedDict):
@@ -78,19 +81,37 @@ async def vixen_state_socket(websocket: WebSocket, feature_name: str):
                     if not input_event.data:
                         raise ErrorEvent("GET", "Missing item data")
 
+                    keys = input_event.data.get("keys")
+                    if keys:
+                        try:
+                            items = VxConfig.get_state_items(keys)
+                        except Exception as exception:
+                            raise ErrorEvent(
+                                event="GET",
+                                message=str(exception),
+                                data={"keys": keys},
+                            )
+
+                        SocketQueue.send(
+                            websocket,
+                            OutputEvent(id="UPDATE_ITEMS", data={"items": items}),
+                        )
+                        continue
+
                     key = input_event.data.get("key")
                     if not key:
                         raise ErrorEvent("GET", "Missing item key")
 
                     try:
-                        await websocket.send_json(
+                        SocketQueue.send(
+                            websocket,
                             OutputEvent(
                                 id="UPDATE",
                                 data={
                                     "key": key,
                                     "value": VxConfig.get_state(key),
                                 },
-                            )
+                            ),
                         )
                     except Exception as exception:
                         raise ErrorEvent(
@@ -116,6 +137,37 @@ async def vixen_state_socket(websocket: WebSocket, feature_name: str):
                             data={"key": key},
                         )
 
+                if input_event.id == "RESYNC":
+                    data = input_event.data or {}
+
+                    # Without subscriptions the socket receives (and resyncs)
+                    # every key.
+                    try:
+                        changes = VxConfig.get_state_changes(
+                            data.get("version"),
+                            data.get("epoch"),
+                            VxConfig.get_state_patterns(websocket),
+                        )
+                    except Exception as exception:
+                        raise ErrorEvent("RESYNC", str(exception), data)
+
+                    # Updates made after the resync are queued behind it (a
+                    # merged STATE event moves to the tail of the queue).
+                    SocketQueue.send(websocket, OutputEvent(id="RESYNC", data=changes))
+
+                if input_event.id in ["SUBSCRIBE", "UNSUBSCRIBE"]:
+                    if not input_event.data:
+                        raise ErrorEvent(input_event.id, "Missing item data")
+
+                    keys = input_event.data.get("keys")
+                    if not keys or not isinstance(keys, list):
+                        raise ErrorEvent(input_event.id, "Missing item keys")
+
+                    if input_event.id == "SUBSCRIBE":
+                        VxConfig.subscribe_state(websocket, keys)
+                    else:
+                        VxConfig.unsubscribe_state(websocket, keys)
+
                 if input_event.id == "SAVE":
                     try:
                         VxConfig.save_state()
@@ -144,8 +196,8 @@ async def vixen_state_socket(websocket: WebSocket, feature_name: str):
                     f"[State socket]: {error_event.data}",
                     "WARNING",
                 )
-                await websocket.send_json(
-                    OutputEvent(id="ERROR", data=error_event.data)
+                SocketQueue.send(
+                    websocket, OutputEvent(id="ERROR", data=error_event.data)
                 )
 
             except ValidationError as exception:
@@ -153,8 +205,9 @@ async def vixen_state_socket(websocket: WebSocket, feature_name: str):
                     f"[State socket]: {str(exception)}",
                     "WARNING",
                 )
-                await websocket.send_json(
-                    OutputEvent(id="ERROR", data=json.loads(exception.json()))
+                SocketQueue.send(
+                    websocket,
+                    OutputEvent(id="ERROR", data=json.loads(exception.json())),
                 )
 
     except:
@@ -200,16 +253,18 @@ async def vixen_systray_socket(websocket: WebSocket, feature_name: str):
                 input_event = InputSysTrayEvent(**await websocket.receive_json())
 
                 if input_event.id == "UPDATE":
-                    await websocket.send_json(
-                        {"id": "UPDATE", "data": {"systray": SysTrayState.state}}
+                    SocketQueue.send(
+                        websocket,
+                        {"id": "UPDATE", "data": {"systray": SysTrayState.state}},
                     )
             except ValidationError as exception:
                 Logger.log(
                     f"[SysTray socket]: {str(exception)}",
                     "WARNING",
                 )
-                await websocket.send_json(
-                    OutputEvent(id="ERROR", data=json.loads(exception.json()))
+                SocketQueue.send(
+                    websocket,
+                    OutputEvent(id="ERROR", data=json.loads(exception.json())),
                 )
     except:
         await feature.detach_websocket("systray", websocket)
@@ -250,14 +305,15 @@ async def vixen_frame_socket(websocket: WebSocket, feature_name: str):
     )
 
     try:
-        await websocket.send_json(
+        SocketQueue.send(
+            websocket,
             OutputEvent(
                 id="FRAME_IDS",
                 data={
                     "frame_ids": feature.frame_ids,
                     "active_frame_ids": feature.active_frame_ids,
                 },
-            )
+            ),
         )
 
         while True:
@@ -326,8 +382,8 @@ async def vixen_frame_socket(websocket: WebSocket, feature_name: str):
                     f"[Frames socket]: {error_event.data}",
                     "WARNING",
                 )
-                await websocket.send_json(
-                    OutputEvent(id="ERROR", data=error_event.data)
+                SocketQueue.send(
+                    websocket, OutputEvent(id="ERROR", data=error_event.data)
                 )
 
             except ValidationError as exception:
@@ -335,8 +391,9 @@ async def vixen_frame_socket(websocket: WebSocket, feature_name: str):
                     f"[Frames socket]: {str(exception)}",
                     "WARNING",
                 )
-                await websocket.send_json(
-                    OutputEvent(id="ERROR", data=json.loads(exception.json()))
+                SocketQueue.send(
+                    websocket,
+                    OutputEvent(id="ERROR", data=json.loads(exception.json())),
                 )
 
     except:
@@ -438,7 +495,7 @@ async def feature_sockets(websocket: WebSocket, feature_name: str, handler_name:
 class IntervalModel(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
-    interval: float
+    interval: float = Field(gt=0)
 
 
 class DataHandlerModel(BaseModel):
@@ -447,27 +504,46 @@ class DataHandlerModel(BaseModel):
     data_name: str
     handler_name: str
     handler_args: list = []
+    interval: float | None = Field(default=None, gt=0)
 
 
-class InputDataStreamEvent(BaseModel):
+class DataNameModel(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
-    id: Literal["SET_INTERVAL", "ADD_HANDLER"]
-    data: Union[IntervalModel, DataHandlerModel]
+    data_name: str
 
 
-class DataHandler:
-    def __init__(self, data_name: str, handler, handler_args: list = []):
-        self.data_name = data_name
-        self.handler = handler
-        self.handler_args = handler_args
+class HandlerIntervalModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
 
-    def get_data(self):
-        try:
-            return self.handler(*self.handler_args)
-        except Exception as exception:
-            Logger.log_exception(exception)
-            raise exception
+    data_name: str
+    interval: float | None = Field(gt=0)
+
+
+class DeltaModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    delta: bool
+    snapshot_interval: float = Field(default=30, gt=0)
+
+
+class InputDataStreamEvent(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    id: Literal[
+        "SET_INTERVAL",
+        "ADD_HANDLER",
+        "REMOVE_HANDLER",
+        "SET_HANDLER_INTERVAL",
+        "SET_DELTA",
+    ]
+    data: Union[
+        IntervalModel,
+        DataHandlerModel,
+        DataNameModel,
+        HandlerIntervalModel,
+        DeltaModel,
+    ]
 
 
 @api.websocket("/feature/{feature_name}/data_streamer")
@@ -488,26 +564,8 @@ async def feature_data_streamer(websocket: WebSocket, feature_name: str):
         f'(Feature WebSockets: {len(feature.feature_websockets)}) - "/feature/{feature_name}/data_streamer" [connected]'
     )
 
-    data_handlers: list[DataHandler] = []
-    interval: float = 1
-
-    async def stream_loop():
-        try:
-            while True:
-                data = {}
-                current_handlers = data_handlers.copy()
-
-                for handler in current_handlers:
-                    data[handler.data_name] = handler.get_data()
-
-                await websocket.send_json(OutputEvent(id="UPDATE", data=data))
-                await asyncio.sleep(interval)
-        except asyncio.CancelledError:
-            pass
-        except:
-            raise
-
-    stream_task = asyncio.create_task(stream_loop())
+    data_streamer = feature.data_streamer
+    subscriber = data_streamer.subscribe(websocket)
 
     try:
         while True:
@@ -515,30 +573,141 @@ async def feature_data_streamer(websocket: WebSocket, feature_name: str):
                 input_event = InputDataStreamEvent(**await websocket.receive_json())
 
                 if input_event.id == "SET_INTERVAL":
-                    interval = input_event.data.interval
+                    data_streamer.set_interval(subscriber, input_event.data.interval)
+
+                if input_event.id == "SET_DELTA":
+                    data_streamer.set_delta(
+                        subscriber,
+                        input_event.data.delta,
+                        input_event.data.snapshot_interval,
+                    )
 
                 if input_event.id == "ADD_HANDLER":
                     data_handler = input_event.data
 
-                    data_handlers.append(
-                        DataHandler(
-                            data_handler.data_name,
-                            feature.contents.get("data", data_handler.handler_name),
-                            data_handler.handler_args,
-                        )
+                    data_streamer.add_handler(
+                        subscriber,
+                        data_handler.data_name,
+                        data_handler.handler_name,
+                        data_handler.handler_args,
+                        data_handler.interval,
+                    )
+
+                if input_event.id == "REMOVE_HANDLER":
+                    data_streamer.remove_handler(subscriber, input_event.data.data_name)
+
+                if input_event.id == "SET_HANDLER_INTERVAL":
+                    data_streamer.set_handler_interval(
+                        subscriber,
+                        input_event.data.data_name,
+                        input_event.data.interval,
                     )
 
+            except WebSocketDisconnect:
+                raise
+
             except Exception as exception:
-                await websocket.send_json(
+                SocketQueue.send(
+                    websocket,
                     OutputEvent(
                         id="ERROR",
                         data={"message": str(exception)},
-                    )
+                    ),
                 )
 
     except:
+        data_streamer.unsubscribe(subscriber)
         await feature.detach_websocket("feature", websocket)
         Logger.log(
             f'(Feature WebSockets: {len(feature.feature_websockets)}) - "/feature/{feature_name}/data_streamer" [disconnected]'
         )
-        stream_task.cancel()
+
+
+# ---------------------------------------------- - - -
+# FEATURE PARAMS SOCKET
+#
+
+
+class ParamPathsModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    paths: list[str]
+
+
+class ParamPathModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    path: str
+
+
+class InputParamsEvent(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    id: Literal["SUBSCRIBE", "UNSUBSCRIBE", "GET"]
+    data: Union[ParamPathsModel, ParamPathModel]
+
+
+@api.websocket("/feature/{feature_name}/params")
+async def feature_params_socket(websocket: WebSocket, feature_name: str):
+    await websocket.accept()
+
+    async def revoke_websocket(message: str):
+        await websocket.send_json(OutputEvent(id="ERROR", data={"message": message}))
+        await websocket.close(reason=message)
+
+    try:
+        feature = get_feature(feature_name)
+    except Exception as exception:
+        return await revoke_websocket(str(exception))
+
+    feature.attach_websocket("feature", websocket)
+    Logger.log(
+        f'(Feature WebSockets: {len(feature.feature_websockets)}) - "/feature/{feature_name}/params" [connected]'
+    )
+
+    subscriber = ParamsSubscriber(feature_name, websocket)
+
+    try:
+        while True:
+            try:
+                input_event = InputParamsEvent(**await websocket.receive_json())
+
+                if input_event.id == "SUBSCRIBE":
+                    for path in input_event.data.paths:
+                        subscriber.subscribe(path)
+
+                if input_event.id == "UNSUBSCRIBE":
+                    for path in input_event.data.paths:
+                        subscriber.unsubscribe(path)
+
+                if input_event.id == "GET":
+                    path = input_event.data.path
+
+                    SocketQueue.send(
+                        websocket,
+                        OutputEvent(
+                            id="VALUE",
+                            data={
+                                "path": path,
+                                "value": ParamDataHandler.get_value(
+                                    f"{feature_name}.{path}"
+                                ),
+                            },
+                        ),
+                    )
+
+            except WebSocketDisconnect:
+                raise
+
+            except Exception as exception:
+                SocketQueue.send(
+                    websocket,
+                    OutputEvent(id="ERROR", data={"message": str(exception)}),
+                )
+
+    except:
+        subscriber.close()
+        await feature.detach_websocket("feature", websocket)
+        Logger.log(
+            f'(Feature WebSockets: {len(feature.feature_websockets)}) - "/feature/{feature_name}/params" [disconnected]'
+        )
@@ -0,0 +1,146 @@
+import asyncio, inspect, time, uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Literal
+from vx_features import RootContents
+from vx_logger import Logger
+from .. import AsyncLoop
+
+ActionJobStatus = Literal["running", "done", "failed"]
+
+
+class ActionJob:
+    def __init__(self, feature_name: str, action_name: str):
+        self.job_id = uuid.uuid4().hex
+        self.feature_name = feature_name
+        self.action_name = action_name
+        self.status: ActionJobStatus = "running"
+        self.progress: float | None = None
+        self.message: str | None = None
+        self.result: Any = None
+        self.error: str | None = None
+        self.started = time.time()
+        self.completed: float | None = None
+        self.task: asyncio.Task = None
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "feature_name": self.feature_name,
+            "action_name": self.action_name,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "result": self.result,
+            "error": self.error,
+            "started": self.started,
+            "completed": self.completed,
+        }
+
+
+class ActionHandler:
+    max_workers: int = 4
+    max_jobs: int = 32
+    # Sync actions awaited by the caller keep running one at a time, in
+    # order, background jobs run concurrently on their own workers.
+    foreground_executor = ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="vx_action_handler"
+    )
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="vx_action_job"
+    )
+    jobs: OrderedDict[str, ActionJob] = OrderedDict()
+
+    def __init__(
+        self,
+        action_name: str,
+        contents: RootContents,
+        handler_args: list = [],
+    ):
+        self.feature_name = contents.name
+        self.action_name = action_name
+        self.handler = contents.get("task", action_name)
+        self.handler_args = handler_args
+
+        try:
+            parameters = inspect.signature(self.handler).parameters
+        except ValueError:
+            parameters = {}
+
+        self.accepts_progress = "progress" in parameters
+
+    @staticmethod
+    def shutdown():
+        ActionHandler.foreground_executor.shutdown(wait=False, cancel_futures=True)
+        ActionHandler.executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def get_job(job_id: str) -> ActionJob | None:
+        return ActionHandler.jobs.get(job_id)
+
+    @staticmethod
+    def __register_job(job: ActionJob):
+        ActionHandler.jobs[job.job_id] = job
+
+        # Only the most recent finished jobs are kept.
+        finished = [
+            job_id
+            for job_id, job in ActionHandler.jobs.items()
+            if job.status != "running"
+        ]
+
+        for job_id in finished[: max(len(finished) - ActionHandler.max_jobs, 0)]:
+            del ActionHandler.jobs[job_id]
+
+    async def run(self, progress: Callable[..., None] = None, background: bool = False):
+        kwargs = {}
+
+        if self.accepts_progress:
+            kwargs["progress"] = progress or (lambda *args, **kwargs: None)
+
+        if inspect.iscoroutinefunction(self.handler):
+            return await self.handler(*self.handler_args, **kwargs)
+
+        return await asyncio.get_running_loop().run_in_executor(
+            (
+                ActionHandler.executor
+                if background
+                else ActionHandler.foreground_executor
+            ),
+            partial(self.handler, *self.handler_args, **kwargs),
+        )
+
+    def start_job(self, on_update: Callable[[ActionJob], None]) -> ActionJob:
+        job = ActionJob(self.feature_name, self.action_name)
+
+        def progress(value: float | None = None, message: str | None = None):
+            def update():
+                if job.status != "running":
+                    return
+
+                job.progress = value
+                job.message = message
+                on_update(job)
+
+            # Sync actions report their progress from an executor thread.
+            AsyncLoop.call_soon(update)
+
+        async def run_job():
+            try:
+                job.result = await self.run(progress, background=True)
+                job.status = "done"
+            except Exception as exception:
+                Logger.log_exception(exception)
+                job.error = str(exception)
+                job.status = "failed"
+
+            job.completed = time.time()
+            ActionHandler.__register_job(job)
+            on_update(job)
+
+        ActionHandler.__register_job(job)
+        job.task = asyncio.create_task(run_job())
+        on_update(job)
+
+        return job
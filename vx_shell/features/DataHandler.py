@@ -0,0 +1,182 @@
+import asyncio, json, inspect
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable
+from vx_features import RootContents
+from vx_logger import Logger
+
+DataHandlerKey = tuple[str, str]
+
+
+class DataHandlerTimeoutError(TimeoutError):
+    def __init__(self, handler_name: str, timeout: float) -> None:
+        super().__init__(f"Data handler '{handler_name}' timed out after {timeout}s")
+        self.handler_name = handler_name
+        self.timeout = timeout
+
+
+class DataHandlerBusyError(RuntimeError):
+    def __init__(self, handler_name: str) -> None:
+        super().__init__(
+            f"Data handler '{handler_name}' is still running after timing out"
+        )
+        self.handler_name = handler_name
+
+
+class DataHandler:
+    max_workers: int = 4
+    default_timeout: float = 5
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="vx_data_handler"
+    )
+    # Sync handlers that timed out keep their worker until they return, no
+    # other call of them is accepted meanwhile so they cannot take every worker.
+    __timed_out: dict[tuple[str, str], Future] = {}
+    # Latest values of the sources running in a data streamer.
+    __source_values: dict[tuple[str, DataHandlerKey], Any] = {}
+
+    def __init__(
+        self,
+        data_name: str,
+        handler_name: str,
+        contents: RootContents,
+        handler_args: list = [],
+    ):
+        self.data_name = data_name
+        self.handler_name = handler_name
+        self.feature_name = contents.name
+        self.handler = contents.get("data", handler_name)
+        self.cache = contents.get_cache(handler_name)
+        self.handler_args = handler_args
+        self.__future: Future = None
+        self.key: DataHandlerKey = (
+            handler_name,
+            json.dumps(handler_args, sort_keys=True),
+        )
+
+        options = contents.get_options("data", handler_name)
+        self.is_source: bool = options.get(
+            "source", False
+        ) or inspect.isasyncgenfunction(self.handler)
+        self.current_handler = options.get("current")
+
+        timeout = options.get("timeout")
+        self.timeout: float = (
+            DataHandler.default_timeout if timeout is None else timeout
+        )
+
+    @staticmethod
+    def shutdown():
+        DataHandler.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def values(self) -> AsyncIterator[Any]:
+        if inspect.isasyncgenfunction(self.handler):
+            generator = self.handler(*self.handler_args)
+
+            try:
+                async for value in generator:
+                    yield value
+            finally:
+                await generator.aclose()
+
+            return
+
+        # Callback sources are called with an 'emit' function, usable from any
+        # thread, and may return a cleanup function. Values emitted faster than
+        # they are consumed are collapsed to the latest one.
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        latest: list = []
+        closed = False
+
+        def on_emit(value):
+            latest[:] = [value]
+            changed.set()
+
+        def emit(value):
+            if not closed:
+                loop.call_soon_threadsafe(on_emit, value)
+
+        cleanup = self.handler(emit, *self.handler_args)
+
+        try:
+            while True:
+                await changed.wait()
+                changed.clear()
+                yield latest.pop()
+        finally:
+            closed = True
+
+            if callable(cleanup):
+                cleanup()
+
+    def set_source_value(self, value: Any):
+        DataHandler.__source_values[(self.feature_name, self.key)] = value
+
+    def clear_source_value(self):
+        DataHandler.__source_values.pop((self.feature_name, self.key), None)
+
+    async def __run_callback(self, callback: Callable):
+        if inspect.iscoroutinefunction(callback):
+            return await callback(*self.handler_args)
+
+        self.__future = DataHandler.executor.submit(callback, *self.handler_args)
+        return await asyncio.wrap_future(self.__future)
+
+    async def __run(self):
+        if self.is_source:
+            source_key = (self.feature_name, self.key)
+
+            if source_key in DataHandler.__source_values:
+                return DataHandler.__source_values[source_key]
+
+            if self.current_handler:
+                return await self.__run_callback(self.current_handler)
+
+            # Without hook, the source is started until its first value.
+            values = self.values()
+
+            try:
+                return await anext(values)
+            finally:
+                await values.aclose()
+
+        return await self.__run_callback(self.handler)
+
+    def __hold_until_done(self):
+        timed_out_key = (self.feature_name, self.handler_name)
+        DataHandler.__timed_out[timed_out_key] = self.__future
+
+        # Called right away if the handler already returned.
+        self.__future.add_done_callback(
+            lambda _: DataHandler.__timed_out.pop(timed_out_key, None)
+        )
+
+    async def get_data(self):
+        if self.cache:
+            hit, value = self.cache.get(self.key[1])
+
+            if hit:
+                return value
+
+        if (self.feature_name, self.handler_name) in DataHandler.__timed_out:
+            exception = DataHandlerBusyError(self.handler_name)
+            Logger.log(str(exception), "WARNING")
+            raise exception
+
+        try:
+            value = await asyncio.wait_for(self.__run(), self.timeout)
+        except asyncio.TimeoutError:
+            if self.__future and not self.__future.done():
+                self.__hold_until_done()
+
+            exception = DataHandlerTimeoutError(self.handler_name, self.timeout)
+            Logger.log(str(exception), "WARNING")
+            raise exception
+        except Exception as exception:
+            Logger.log_exception(exception)
+            raise exception
+
+        if self.cache:
+            self.cache.set(self.key[1], value)
+
+        return value
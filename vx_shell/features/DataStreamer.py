@@ -0,0 +1,532 @@
+import asyncio, copy, heapq, itertools
+from typing import TypedDict, Optional, Any
+from fastapi import WebSocket
+from vx_features import RootContents
+from vx_logger import Logger
+from .DataHandler import DataHandler, DataHandlerKey
+from .. import SocketQueue
+
+
+class OutputEvent(TypedDict):
+    id: str
+    data: Optional[dict]
+
+
+def merge_data_events(pending: OutputEvent, event: OutputEvent) -> OutputEvent:
+    return OutputEvent(
+        id="SNAPSHOT" if "SNAPSHOT" in (pending["id"], event["id"]) else "UPDATE",
+        data={**pending["data"], **event["data"]},
+    )
+
+
+class DataStreamStats:
+    smoothing: float = 0.1
+
+    def __init__(self):
+        self.ticks: int = 0
+        self.overruns: int = 0
+        self.period: float | None = None
+        self.jitter: float = 0
+        self.duration: float = 0
+        self.last_run: float | None = None
+
+    def __smooth(self, average: float, value: float) -> float:
+        return average + (value - average) * DataStreamStats.smoothing
+
+    def __record_period(self, started: float) -> float | None:
+        period = None
+
+        if self.last_run is not None:
+            period = started - self.last_run
+            self.period = (
+                period if self.period is None else self.__smooth(self.period, period)
+            )
+
+        self.last_run = started
+        self.ticks += 1
+        return period
+
+    def record_run(self, started: float, completed: float, interval: float):
+        period = self.__record_period(started)
+
+        if period is not None:
+            self.jitter = self.__smooth(self.jitter, abs(period - interval))
+
+        self.duration = self.__smooth(self.duration, completed - started)
+
+    def record_event(self, received: float):
+        self.__record_period(received)
+
+    def to_dict(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "period": self.period,
+            "jitter": self.jitter,
+            "duration": self.duration,
+        }
+
+
+class DataSubscription:
+    def __init__(
+        self,
+        subscriber: "DataSubscriber",
+        handler: DataHandler,
+        interval: float | None = None,
+    ):
+        self.subscriber = subscriber
+        self.handler = handler
+        self.interval = interval
+        self.generation: int = 0
+        self.slot: int | None = None
+        self.stats = DataStreamStats()
+
+    @property
+    def data_name(self) -> str:
+        return self.handler.data_name
+
+    @property
+    def effective_interval(self) -> float | None:
+        if self.handler.is_source:
+            return None
+
+        return self.interval or self.subscriber.interval
+
+
+class DataSubscriber:
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.subscriptions: dict[str, DataSubscription] = {}
+        self.interval: float = 1
+        # -------------------------------------------- - - -
+        self.delta: bool = False
+        self.snapshot_interval: float = 30
+        self.last_snapshot: float | None = None
+        self.last_sent: dict[str, Any] = {}
+
+    def encode(self, data: dict[str, Any], now: float) -> OutputEvent | None:
+        if not self.delta:
+            return OutputEvent(id="UPDATE", data=data)
+
+        if (
+            self.last_snapshot is None
+            or now - self.last_snapshot >= self.snapshot_interval
+        ):
+            self.last_snapshot = now
+            self.last_sent.update(copy.deepcopy(data))
+            return OutputEvent(id="SNAPSHOT", data=copy.deepcopy(self.last_sent))
+
+        changes = {
+            key: value
+            for key, value in data.items()
+            if key not in self.last_sent or self.last_sent[key] != value
+        }
+
+        if not changes:
+            return None
+
+        self.last_sent.update(copy.deepcopy(changes))
+        return OutputEvent(id="UPDATE", data=changes)
+
+
+class DataSource:
+    def __init__(self, handler: DataHandler):
+        self.handler = handler
+        self.subscriptions: list[DataSubscription] = []
+        self.has_value: bool = False
+        self.value: Any = None
+        self.task: asyncio.Task = None
+
+
+class DataStreamer:
+    def __init__(self, contents: RootContents):
+        self.contents = contents
+        self.subscribers: list[DataSubscriber] = []
+        self.__sources: dict[DataHandlerKey, DataSource] = {}
+        self.__timers: list[tuple[float, int, int, DataSubscription]] = []
+        self.__sequence = itertools.count()
+        self.__task: asyncio.Task = None
+        self.__tick_tasks: set[asyncio.Task] = set()
+        self.__wakeup = asyncio.Event()
+
+    @staticmethod
+    def next_slot(now: float, interval: float) -> int:
+        return int(now // interval) + 1
+
+    def __schedule(
+        self, subscription: DataSubscription, deadline: float, slot: int = None
+    ):
+        subscription.generation += 1
+        subscription.slot = slot
+
+        heapq.heappush(
+            self.__timers,
+            (
+                deadline,
+                next(self.__sequence),
+                subscription.generation,
+                subscription,
+            ),
+        )
+        self.__wakeup.set()
+
+    def __schedule_slot(self, subscription: DataSubscription, slot: int):
+        # Deadlines are absolute multiples of the interval on the loop clock,
+        # so they never drift and the subscriptions sharing an interval are
+        # served by the same tick.
+        self.__schedule(subscription, slot * subscription.effective_interval, slot)
+
+    def __reschedule(self, subscription: DataSubscription):
+        self.__schedule_slot(
+            subscription,
+            self.next_slot(
+                asyncio.get_running_loop().time(), subscription.effective_interval
+            ),
+        )
+
+    def __schedule_next(self, subscription: DataSubscription, completed: float):
+        interval = subscription.effective_interval
+
+        if subscription.slot is None:
+            slot = self.next_slot(completed, interval)
+        else:
+            slot = subscription.slot + 1
+
+            # Ticks missed while the handler was computing are skipped
+            # instead of being queued.
+            if slot * interval <= completed:
+                next_slot = self.next_slot(completed, interval)
+                subscription.stats.overruns += next_slot - slot
+                slot = next_slot
+
+        self.__schedule_slot(subscription, slot)
+
+    def __cancel(self, subscription: DataSubscription):
+        # Heap entries of a cancelled subscription are skipped when popped.
+        subscription.generation += 1
+
+        if subscription.handler.is_source:
+            self.__detach_source(subscription)
+
+    def __attach_source(self, subscription: DataSubscription):
+        # Push sources are shared by every subscription of the same handler
+        # and arguments, they are only running while subscribed to.
+        key = subscription.handler.key
+        source = self.__sources.get(key)
+
+        if not source:
+            source = DataSource(subscription.handler)
+            source.task = asyncio.create_task(self.__pump(source))
+            self.__sources[key] = source
+
+        source.subscriptions.append(subscription)
+
+        if source.has_value:
+            self.__publish(
+                subscription, source.value, asyncio.get_running_loop().time()
+            )
+
+    def __detach_source(self, subscription: DataSubscription):
+        key = subscription.handler.key
+        source = self.__sources.get(key)
+
+        if not source or not subscription in source.subscriptions:
+            return
+
+        source.subscriptions.remove(subscription)
+
+        if not source.subscriptions:
+            del self.__sources[key]
+            source.task.cancel()
+
+    async def __pump(self, source: DataSource):
+        loop = asyncio.get_running_loop()
+
+        try:
+            async for value in source.handler.values():
+                # Only real changes are forwarded.
+                if source.has_value and value == source.value:
+                    continue
+
+                source.value = copy.deepcopy(value)
+                source.has_value = True
+                source.handler.set_source_value(source.value)
+                now = loop.time()
+
+                for subscription in source.subscriptions.copy():
+                    subscription.stats.record_event(now)
+                    self.__publish(subscription, value, now)
+
+            # The subscriptions of an ended source would never be updated.
+            for subscription in source.subscriptions.copy():
+                self.__fail(
+                    subscription,
+                    RuntimeError(
+                        f"'{source.handler.handler_name}' data source has ended"
+                    ),
+                )
+
+        except asyncio.CancelledError:
+            pass
+
+        except Exception as exception:
+            Logger.log_exception(exception)
+
+            for subscription in source.subscriptions.copy():
+                self.__fail(subscription, exception)
+
+        finally:
+            if self.__sources.get(source.handler.key) is source:
+                del self.__sources[source.handler.key]
+
+            # A new source of the same handler may already be running.
+            if not source.handler.key in self.__sources:
+                source.handler.clear_source_value()
+
+    def subscribe(self, websocket: WebSocket) -> DataSubscriber:
+        subscriber = DataSubscriber(websocket)
+        self.subscribers.append(subscriber)
+
+        if not self.__task or self.__task.done():
+            self.__task = asyncio.create_task(self.__stream_loop())
+
+        return subscriber
+
+    def unsubscribe(self, subscriber: DataSubscriber):
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+
+        for subscription in subscriber.subscriptions.values():
+            self.__cancel(subscription)
+
+        subscriber.subscriptions = {}
+
+        if not self.subscribers:
+            self.stop()
+
+    def stop(self):
+        self.subscribers = []
+        self.__timers = []
+
+        for source in self.__sources.values():
+            source.task.cancel()
+
+        self.__sources = {}
+
+        if self.__task:
+            self.__task.cancel()
+            self.__task = None
+
+        for tick_task in self.__tick_tasks.copy():
+            tick_task.cancel()
+
+    def set_interval(self, subscriber: DataSubscriber, interval: float):
+        subscriber.interval = interval
+
+        for subscription in subscriber.subscriptions.values():
+            if subscription.interval is None and not subscription.handler.is_source:
+                self.__reschedule(subscription)
+
+    def set_delta(
+        self, subscriber: DataSubscriber, delta: bool, snapshot_interval: float
+    ):
+        subscriber.delta = delta
+        subscriber.snapshot_interval = snapshot_interval
+        subscriber.last_snapshot = None
+        subscriber.last_sent = {}
+
+    def add_handler(
+        self,
+        subscriber: DataSubscriber,
+        data_name: str,
+        handler_name: str,
+        handler_args: list = [],
+        interval: float | None = None,
+    ):
+        handler = DataHandler(data_name, handler_name, self.contents, handler_args)
+
+        if handler.is_source and interval is not None:
+            raise ValueError(f"'{handler_name}' data source has no interval")
+
+        subscription = DataSubscription(subscriber, handler, interval)
+
+        if data_name in subscriber.subscriptions:
+            self.__cancel(subscriber.subscriptions[data_name])
+
+        subscriber.subscriptions[data_name] = subscription
+
+        if handler.is_source:
+            self.__attach_source(subscription)
+        else:
+            self.__schedule(subscription, asyncio.get_running_loop().time())
+
+    def remove_handler(self, subscriber: DataSubscriber, data_name: str):
+        if not data_name in subscriber.subscriptions:
+            raise KeyError(f"'{data_name}' data handler not found")
+
+        self.__cancel(subscriber.subscriptions.pop(data_name))
+        subscriber.last_sent.pop(data_name, None)
+
+    def set_handler_interval(
+        self, subscriber: DataSubscriber, data_name: str, interval: float | None
+    ):
+        if not data_name in subscriber.subscriptions:
+            raise KeyError(f"'{data_name}' data handler not found")
+
+        subscription = subscriber.subscriptions[data_name]
+
+        if subscription.handler.is_source:
+            raise ValueError(f"'{data_name}' data source has no interval")
+
+        subscription.interval = interval
+        self.__reschedule(subscription)
+
+    def __pop_due_subscriptions(self, now: float) -> list[DataSubscription]:
+        subscriptions: list[DataSubscription] = []
+
+        while self.__timers and self.__timers[0][0] <= now:
+            _, _, generation, subscription = heapq.heappop(self.__timers)
+
+            if generation == subscription.generation:
+                subscriptions.append(subscription)
+
+        return subscriptions
+
+    async def __tick(self, subscriptions: list[DataSubscription], now: float):
+        loop = asyncio.get_running_loop()
+        handlers: dict[DataHandlerKey, DataHandler] = {}
+        due: dict[DataSubscriber, list[DataSubscription]] = {}
+        generations = {s: s.generation for s in subscriptions}
+
+        for subscription in subscriptions:
+            handlers.setdefault(subscription.handler.key, subscription.handler)
+            due.setdefault(subscription.subscriber, []).append(subscription)
+
+        values = await asyncio.gather(
+            *(handler.get_data() for handler in handlers.values()),
+            return_exceptions=True,
+        )
+
+        results: dict[DataHandlerKey, Any] = {}
+        errors: dict[DataHandlerKey, Exception] = {}
+
+        for key, value in zip(handlers.keys(), values):
+            if isinstance(value, Exception):
+                errors[key] = value
+            else:
+                results[key] = value
+
+        for subscriber, subscriptions in due.items():
+            data = {}
+
+            for subscription in subscriptions:
+                data_name = subscription.data_name
+                key = subscription.handler.key
+
+                # The subscription may have been removed or replaced while
+                # its handler was running.
+                if subscriber.subscriptions.get(data_name) is not subscription:
+                    continue
+
+                if key in errors:
+                    self.__fail(subscription, errors[key])
+                else:
+                    data[data_name] = results[key]
+                    completed = loop.time()
+
+                    subscription.stats.record_run(
+                        now, completed, subscription.effective_interval
+                    )
+
+                    if subscription.generation == generations[subscription]:
+                        self.__schedule_next(subscription, completed)
+
+            if data:
+                event = subscriber.encode(data, now)
+
+                if event:
+                    self.__send(subscriber, event)
+
+    def stats(self) -> list[dict]:
+        def client_name(websocket: WebSocket) -> str | None:
+            client = getattr(websocket, "client", None)
+            return f"{client.host}:{client.port}" if client else None
+
+        return [
+            {
+                "client": client_name(subscriber.websocket),
+                "interval": subscriber.interval,
+                "delta": subscriber.delta,
+                "handlers": {
+                    data_name: {
+                        "handler_name": subscription.handler.handler_name,
+                        "interval": subscription.effective_interval,
+                        "source": subscription.handler.is_source,
+                        **subscription.stats.to_dict(),
+                    }
+                    for data_name, subscription in subscriber.subscriptions.items()
+                },
+            }
+            for subscriber in self.subscribers
+        ]
+
+    def __fail(self, subscription: DataSubscription, exception: Exception):
+        self.remove_handler(subscription.subscriber, subscription.data_name)
+
+        self.__send(
+            subscription.subscriber,
+            OutputEvent(
+                id="ERROR",
+                data={"message": str(exception), "data_name": subscription.data_name},
+            ),
+        )
+
+    def __publish(self, subscription: DataSubscription, value: Any, now: float):
+        event = subscription.subscriber.encode({subscription.data_name: value}, now)
+
+        if event:
+            self.__send(subscription.subscriber, event)
+
+    def __send(self, subscriber: DataSubscriber, event: OutputEvent):
+        queue = SocketQueue.get(subscriber.websocket)
+
+        if not queue:
+            return
+
+        if event["id"] in ("UPDATE", "SNAPSHOT"):
+            queue.put(event, "DATA", merge_data_events)
+        else:
+            queue.put(event)
+
+    async def __stream_loop(self):
+        loop = asyncio.get_running_loop()
+
+        try:
+            while self.subscribers:
+                now = loop.time()
+                subscriptions = self.__pop_due_subscriptions(now)
+
+                # Ticks run concurrently so that a slow handler does not delay
+                # the others, a subscription is only rescheduled once its
+                # handler completed.
+                if subscriptions:
+                    tick_task = asyncio.create_task(self.__tick(subscriptions, now))
+                    self.__tick_tasks.add(tick_task)
+                    tick_task.add_done_callback(self.__tick_tasks.discard)
+
+                if not self.subscribers:
+                    break
+
+                timeout = self.__timers[0][0] - loop.time() if self.__timers else None
+                self.__wakeup.clear()
+
+                try:
+                    await asyncio.wait_for(
+                        self.__wakeup.wait(),
+                        None if timeout is None else max(timeout, 0),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+        except asyncio.CancelledError:
+            pass
@@ -8,7 +8,8 @@ from vx_gtk import Gtk
 from vx_logger import Logger
 from vx_types import LifeCycleHandler, LifeCycleCleanUpHandler, user_FrameParams_dict
 from vx_gtk.FrameHandler import FrameHandler
-from .. import AsyncLoop
+from .DataStreamer import DataStreamer
+from .. import AsyncLoop, SocketQueue
 
 
 class OutputEvent(TypedDict):
@@ -72,7 +73,10 @@ class Feature:
             with open(locales_file_path, "r", encoding="utf-8") as file:
                 locales = json.load(file)
 
-        self.contents.dispatch("data", "__locales__")(lambda: locales)
+        self.contents.dispatch("data", "__locales__", cache={"ttl": None})(
+            lambda: locales
+        )
+        self.data_streamer = DataStreamer(self.contents)
         # -------------------------------------------- - - -
         self.feature_websockets: list[WebSocket] = []
         self.state_websockets: list[WebSocket] = []
@@ -104,6 +108,7 @@ class Feature:
     ):
         websockets: list[WebSocket] = getattr(self, f"{type}_websockets")
         websockets.append(websocket)
+        SocketQueue.attach(websocket)
 
         if type == "state":
             VxConfig.websockets.append(websocket)
@@ -117,6 +122,8 @@ class Feature:
         type: Literal["feature", "state", "frames", "systray"],
         websocket: WebSocket,
     ):
+        SocketQueue.detach(websocket)
+
         try:
             await websocket.close()
         except:
@@ -127,6 +134,7 @@ class Feature:
 
         if type == "state":
             VxConfig.websockets.remove(websocket)
+            VxConfig.unsubscribe_state(websocket)
 
         if type == "systray":
             SysTrayState.websockets.remove(websocket)
@@ -135,6 +143,8 @@ class Feature:
     async def cleanup_websockets(self):
         async def close_websockets(websockets: list[WebSocket]):
             for websocket in websockets:
+                SocketQueue.detach(websocket)
+
                 try:
                     await websocket.close()
                 except:
@@ -147,6 +157,7 @@ class Feature:
 
         for websocket in self.state_websockets:
             VxConfig.websockets.remove(websocket)
+            VxConfig.unsubscribe_state(websocket)
 
         for websocket in self.systray_websockets:
             SysTrayState.websockets.remove(websocket)
@@ -246,6 +257,7 @@ class Feature:
 
     @check_is_started(True)
     async def __stop(self, cleanup: bool = True) -> bool:
+        self.data_streamer.stop()
         await self.cleanup_websockets()
 
         if cleanup:
@@ -262,7 +274,13 @@ class Feature:
 
     async def dispatch_frame_event(self, event: OutputEvent):
         for websocket in self.frames_websockets:
-            await websocket.send_json(event)
+            SocketQueue.send(websocket, event)
+
+    def dispatch_job_event(self, job: dict):
+        for websocket in self.frames_websockets:
+            SocketQueue.send(
+                websocket, OutputEvent(id="JOB", data=job), f"JOB:{job['job_id']}"
+            )
 
     @check_is_started(True)
     def open_frame(self, frame_id: str):
@@ -356,6 +374,48 @@ class Feature:
 
         return result
 
+    @check_is_started(True)
+    def new_frames_from_template(
+        self, frames_params_dict: dict[str, user_FrameParams_dict]
+    ) -> bool:
+        result = FrameHandler.new_frames_from_template(
+            self.feature_name, frames_params_dict
+        )
+
+        if result:
+            asyncio.create_task(
+                self.dispatch_frame_event(
+                    OutputEvent(
+                        id="NEW_FROM_TEMPLATES",
+                        data={
+                            "new_frame_ids": list(frames_params_dict.keys()),
+                            "frame_ids": self.frame_ids,
+                        },
+                    )
+                )
+            )
+
+        return result
+
+    @check_is_started(True)
+    def remove_frames_from_template(self, frame_ids: list[str]) -> bool:
+        result = FrameHandler.remove_frames_from_template(self.feature_name, frame_ids)
+
+        if result:
+            asyncio.create_task(
+                self.dispatch_frame_event(
+                    OutputEvent(
+                        id="REMOVE_FROM_TEMPLATES",
+                        data={
+                            "removed_frame_ids": frame_ids,
+                            "frame_ids": self.frame_ids,
+                        },
+                    )
+                )
+            )
+
+        return result
+
     @property
     @check_is_started(True)
     def frame_ids(self):
@@ -4,6 +4,7 @@ from vx_root.references.AbsFrames import get_frames_reference
 from vx_root.references.AbsParams import get_params_reference
 from vx_config import VxConfig
 from vx_logger import Logger
+from .. import AsyncLoop
 
 from vx_features import (
     FeatureUtils,
@@ -83,6 +84,7 @@ class FeatureLoader:
                     dev_mode=self.is_dev_feature,
                 ),
             )
+            ParamDataHandler.watch_params(self.feature_name, AsyncLoop.call_soon)
 
             VxConfig.update_state(
                 feature_state=ParamDataHandler.get_value(f"{self.feature_name}.state"),
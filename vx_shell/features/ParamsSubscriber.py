@@ -0,0 +1,97 @@
+import threading
+from typing import TypedDict, Optional, Any
+from fastapi import WebSocket
+from vx_features import ParamDataHandler
+from vx_logger import Logger
+from .. import AsyncLoop, SocketQueue
+
+
+class OutputEvent(TypedDict):
+    id: str
+    data: Optional[dict]
+
+
+def merge_params_events(pending: OutputEvent, event: OutputEvent) -> OutputEvent:
+    return OutputEvent(
+        id="UPDATE",
+        data={"params": {**pending["data"]["params"], **event["data"]["params"]}},
+    )
+
+
+class ParamsSubscriber:
+    def __init__(self, feature_name: str, websocket: WebSocket):
+        self.feature_name = feature_name
+        self.websocket = websocket
+        self.listeners: dict[str, Any] = {}
+        # -------------------------------------------- - - -
+        self.__changed_paths: dict[str, None] = {}
+        self.__flush_scheduled: bool = False
+        self.__lock = threading.Lock()
+
+    def __full_path(self, param_path: str) -> str:
+        return f"{self.feature_name}.{param_path}" if param_path else self.feature_name
+
+    def subscribe(self, param_path: str):
+        if param_path in self.listeners:
+            return
+
+        def listener(changes: dict[str, Any]):
+            self.__on_changes(list(changes.keys()))
+
+        ParamDataHandler.add_param_batch_listener(
+            self.__full_path(param_path), listener
+        )
+        self.listeners[param_path] = listener
+
+    def unsubscribe(self, param_path: str):
+        if not param_path in self.listeners:
+            raise KeyError(f"'{param_path}' param path is not subscribed")
+
+        ParamDataHandler.remove_param_batch_listener(
+            self.__full_path(param_path), self.listeners.pop(param_path)
+        )
+
+    def close(self):
+        for param_path in list(self.listeners.keys()):
+            try:
+                self.unsubscribe(param_path)
+            except Exception as exception:
+                Logger.log(str(exception), "WARNING")
+
+        self.listeners = {}
+
+    def __on_changes(self, paths: list[str]):
+        # Params can be set from any thread, the changes are collected and
+        # flushed once per loop iteration.
+        with self.__lock:
+            for path in paths:
+                self.__changed_paths[path] = None
+
+            if self.__flush_scheduled:
+                return
+
+            self.__flush_scheduled = True
+
+        AsyncLoop.loop.call_soon_threadsafe(self.__flush)
+
+    def __flush(self):
+        with self.__lock:
+            paths = list(self.__changed_paths.keys())
+            self.__changed_paths = {}
+            self.__flush_scheduled = False
+
+        params = {}
+
+        for path in paths:
+            try:
+                params[path.partition(".")[2]] = ParamDataHandler.get_value(path)
+            except Exception as exception:
+                Logger.log(str(exception), "WARNING")
+
+        if params:
+            SocketQueue.send(
+                self.websocket,
+                OutputEvent(id="UPDATE", data={"params": params}),
+                "PARAMS",
+                merge_params_events,
+            )
@@ -1 +1 @@
-from .classes import ApiServer, AsyncLoop, FrontServer
+from .classes import ApiServer, AsyncLoop, FrontServer, SocketQueue
@@ -1,5 +1,5 @@
 import uvicorn, signal, asyncio, os
-from typing import Coroutine
+from typing import Coroutine, Callable
 from threading import Thread, Event
 from fastapi import FastAPI
 from vx_gtk import GtkApp, Applications
@@ -26,6 +26,17 @@ class AsyncLoop:
     def run_task(task: Coroutine):
         asyncio.run_coroutine_threadsafe(task, AsyncLoop.loop)
 
+    def call_soon(callback: Callable[[], None]):
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is AsyncLoop.loop:
+            callback()
+        else:
+            AsyncLoop.loop.call_soon_threadsafe(callback)
+
 
 class ApiServer:
     server: uvicorn.Server = None
@@ -0,0 +1,191 @@
+import asyncio
+from collections import OrderedDict
+from itertools import count
+from typing import TypedDict, Optional, Callable, Hashable
+from fastapi import WebSocket
+from vx_logger import Logger
+from .ApiServer import AsyncLoop
+
+
+class OutputEvent(TypedDict):
+    id: str
+    data: Optional[dict]
+
+
+EventMerger = Callable[[OutputEvent, OutputEvent], OutputEvent]
+
+
+class SocketQueueMetrics(TypedDict):
+    sent: int
+    dropped: int
+    coalesced: int
+    pending: int
+    lag: float
+
+
+class SocketQueue:
+    max_size: int = 64
+    max_lag: float = 5
+
+    totals: dict[str, int] = {
+        "sent": 0,
+        "dropped": 0,
+        "coalesced": 0,
+        "disconnected": 0,
+    }
+
+    __queues: dict[WebSocket, "SocketQueue"] = {}
+    __sequence = count()
+
+    @staticmethod
+    def attach(websocket: WebSocket) -> "SocketQueue":
+        if not websocket in SocketQueue.__queues:
+            SocketQueue.__queues[websocket] = SocketQueue(websocket)
+
+        return SocketQueue.__queues[websocket]
+
+    @staticmethod
+    def detach(websocket: WebSocket):
+        queue = SocketQueue.__queues.pop(websocket, None)
+
+        if queue:
+            queue.close()
+
+    @staticmethod
+    def get(websocket: WebSocket) -> Optional["SocketQueue"]:
+        return SocketQueue.__queues.get(websocket)
+
+    @staticmethod
+    def send(
+        websocket: WebSocket,
+        event: OutputEvent,
+        key: Hashable = None,
+        merge: EventMerger = None,
+    ):
+        def process():
+            queue = SocketQueue.get(websocket)
+
+            if queue:
+                queue.put(event, key, merge)
+
+        AsyncLoop.call_soon(process)
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.pending: OrderedDict[Hashable, tuple[OutputEvent, float]] = OrderedDict()
+        self.sent: int = 0
+        self.dropped: int = 0
+        self.coalesced: int = 0
+        self.is_closed: bool = False
+
+        self.__loop = asyncio.get_running_loop()
+        self.__ready = asyncio.Event()
+        self.__writer_task = asyncio.create_task(self.__writer())
+
+    @property
+    def lag(self) -> float:
+        if not self.pending:
+            return 0
+
+        _, enqueued_at = next(iter(self.pending.values()))
+        return self.__loop.time() - enqueued_at
+
+    def put(self, event: OutputEvent, key: Hashable = None, merge: EventMerger = None):
+        if self.is_closed:
+            return
+
+        if self.lag > SocketQueue.max_lag:
+            return self.__drop_consumer()
+
+        # Keyed events are latest-value-wins: a pending event with the same
+        # key is replaced (or merged) and moved to the tail, so it is never
+        # sent ahead of the events put before this one.
+        if key is not None and key in self.pending:
+            pending_event, _ = self.pending.pop(key)
+            self.pending[key] = (
+                merge(pending_event, event) if merge else event,
+                self.__loop.time(),
+            )
+            self.__count("coalesced")
+            return
+
+        if len(self.pending) >= SocketQueue.max_size:
+            self.pending.popitem(last=False)
+            self.__count("dropped")
+
+        if key is None:
+            key = ("__unkeyed__", next(SocketQueue.__sequence))
+
+        self.pending[key] = (event, self.__loop.time())
+        self.__ready.set()
+
+    def close(self):
+        if SocketQueue.__queues.get(self.websocket) is self:
+            del SocketQueue.__queues[self.websocket]
+
+        self.is_closed = True
+        self.pending.clear()
+        self.__writer_task.cancel()
+
+    def metrics(self) -> SocketQueueMetrics:
+        return SocketQueueMetrics(
+            sent=self.sent,
+            dropped=self.dropped,
+            coalesced=self.coalesced,
+            pending=len(self.pending),
+            lag=self.lag,
+        )
+
+    def __count(self, metric: str, value: int = 1):
+        setattr(self, metric, getattr(self, metric) + value)
+        SocketQueue.totals[metric] += value
+
+    def __drop_consumer(self):
+        Logger.log(
+            f"[Socket queue]: slow consumer dropped after {SocketQueue.max_lag}s "
+            f"of lag ({len(self.pending)} pending events)",
+            "WARNING",
+        )
+
+        self.__count("dropped", len(self.pending))
+        SocketQueue.totals["disconnected"] += 1
+        self.close()
+
+        async def close_websocket():
+            try:
+                await self.websocket.close(reason="Slow consumer")
+            except:
+                pass
+
+        asyncio.create_task(close_websocket())
+
+    async def __writer(self):
+        try:
+            while True:
+                await self.__ready.wait()
+
+                while self.pending:
+                    _, (event, enqueued_at) = self.pending.popitem(last=False)
+
+                    # A socket that stops reading blocks the send, it is
+                    # dropped once the event is older than the allowed lag.
+                    try:
+                        await asyncio.wait_for(
+                            self.websocket.send_json(event),
+                            max(
+                                SocketQueue.max_lag
+                                - (self.__loop.time() - enqueued_at),
+                                0,
+                            ),
+                        )
+                    except asyncio.TimeoutError:
+                        return self.__drop_consumer()
+
+                    self.__count("sent")
+
+                self.__ready.clear()
+
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            self.close()
@@ -1,2 +1,3 @@
 from .ApiServer import ApiServer, AsyncLoop
 from .FrontServer import FrontServer
+from .SocketQueue import SocketQueue
@@ -1,4 +1,4 @@
-import socket, json, threading, os, time, asyncio
+import socket, json, threading, os, time
 from subprocess import Popen
 from vx_gtk import GLib, DbusmenuGtk3
 from fastapi import WebSocket
@@ -59,11 +59,13 @@ class SysTrayState:
 
         SysTrayState.check_available_menu(data)
 
+        from vx_shell import SocketQueue
+
         for websocket in SysTrayState.websockets:
-            asyncio.run(
-                websocket.send_json(
-                    {"id": "UPDATE", "data": {"systray": SysTrayState.state}}
-                )
+            SocketQueue.send(
+                websocket,
+                {"id": "UPDATE", "data": {"systray": SysTrayState.state}},
+                "UPDATE",
             )
 
 